@@ -0,0 +1,308 @@
+"""Batch API generation for the non-urgent part of the queue"""
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.ai.generator import post_generator
+from app.ai.openai_client import openai_client
+from app.config import settings
+from app.models import GenerationBatch, NewsItem, Post
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("validating", "in_progress", "finalizing", "cancelling")
+FAILED_STATUSES = ("failed", "expired", "cancelled")
+CUSTOM_ID_PREFIX = "news-"
+
+
+@dataclass
+class BatchState:
+    """Batch status reported by a backend"""
+    status: str
+    output_file_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchBackend:
+    """Submits JSONL request files and returns JSONL results"""
+
+    name: str = ""
+    # Status of posts created from results, only `pending` posts get published
+    post_status: str = "pending"
+
+    async def submit(self, path: str) -> Tuple[str, str]:
+        """Submit request file, returns batch id and input file id"""
+        raise NotImplementedError
+
+    async def retrieve(self, batch_id: str) -> BatchState:
+        raise NotImplementedError
+
+    async def download(self, file_id: str) -> str:
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API through the generic client methods"""
+
+    name = "openai"
+
+    async def submit(self, path: str) -> Tuple[str, str]:
+        client = openai_client.client
+        with open(path, "rb") as f:
+            uploaded = await client.files.create(file=(os.path.basename(path), f.read()), purpose="batch")
+
+        batch = await client.post(
+            "/batches",
+            body={
+                "input_file_id": uploaded.id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+            cast_to=object
+        )
+        return batch["id"], uploaded.id
+
+    async def retrieve(self, batch_id: str) -> BatchState:
+        batch = await openai_client.client.get(f"/batches/{batch_id}", cast_to=object)
+        errors = (batch.get("errors") or {}).get("data") or []
+        return BatchState(
+            status=batch["status"],
+            output_file_id=batch.get("output_file_id"),
+            error="; ".join(error.get("message", "") for error in errors) or None
+        )
+
+    async def download(self, file_id: str) -> str:
+        content = await openai_client.client.files.content(file_id)
+        return content.text
+
+
+class LocalBatchBackend(BatchBackend):
+    """File-based stand-in for the Batch API, for offline runs and tests
+
+    Batches are directories under `batch_dir/local`. A batch completes on
+    the first poll after `batch_local_delay` seconds, answering every
+    request with a stub completion in the Batch API output format. Stub
+    posts are stored as drafts and never published.
+    """
+
+    name = "local"
+    post_status = "draft"
+
+    def _path(self, batch_id: str, name: str) -> str:
+        return os.path.join(settings.batch_dir, "local", batch_id, name)
+
+    def _read_state(self, batch_id: str) -> dict:
+        with open(self._path(batch_id, "batch.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_state(self, batch_id: str, state: dict):
+        with open(self._path(batch_id, "batch.json"), "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    async def submit(self, path: str) -> Tuple[str, str]:
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        os.makedirs(os.path.dirname(self._path(batch_id, "input.jsonl")))
+        shutil.copyfile(path, self._path(batch_id, "input.jsonl"))
+        self._write_state(batch_id, {"status": "in_progress", "created_at": time.time()})
+        return batch_id, f"{batch_id}/input.jsonl"
+
+    def _complete(self, batch_id: str):
+        """Write stub responses for every request"""
+        with open(self._path(batch_id, "input.jsonl"), encoding="utf-8") as src, \
+                open(self._path(batch_id, "output.jsonl"), "w", encoding="utf-8") as dst:
+            for number, line in enumerate(src):
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                prompt = request["body"]["messages"][-1]["content"]
+                result = {
+                    "id": f"batch_req_{number}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "model": request["body"]["model"],
+                            "choices": [{
+                                "index": 0,
+                                "message": {
+                                    "role": "assistant",
+                                    "content": f"[local batch] {' '.join(prompt.split())[:200]}"
+                                },
+                                "finish_reason": "stop",
+                            }],
+                        },
+                    },
+                    "error": None,
+                }
+                dst.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    async def retrieve(self, batch_id: str) -> BatchState:
+        state = self._read_state(batch_id)
+        if state["status"] == "in_progress" and time.time() - state["created_at"] >= settings.batch_local_delay:
+            self._complete(batch_id)
+            state.update(status="completed", output_file_id=f"{batch_id}/output.jsonl")
+            self._write_state(batch_id, state)
+        return BatchState(status=state["status"], output_file_id=state.get("output_file_id"))
+
+    async def download(self, file_id: str) -> str:
+        with open(os.path.join(settings.batch_dir, "local", file_id), encoding="utf-8") as f:
+            return f.read()
+
+
+BACKENDS: Dict[str, BatchBackend] = {
+    OpenAIBatchBackend.name: OpenAIBatchBackend(),
+    LocalBatchBackend.name: LocalBatchBackend(),
+}
+
+
+class BatchGenerator:
+    """Generates posts for older pending news through the Batch API
+
+    News published more than `batch_min_age_hours` ago are written to a
+    JSONL request file and submitted as one batch. While the batch runs
+    the news are linked to it and skipped by real-time generation. When
+    it completes, results are mapped back to pending `Post` rows (drafts
+    for the local backend); news without a usable result return to the
+    queue.
+    """
+
+    def get_backend(self, name: str) -> BatchBackend:
+        return BACKENDS[name]
+
+    def _pending_news(self, db) -> List[NewsItem]:
+        cutoff = datetime.utcnow() - timedelta(hours=settings.batch_min_age_hours)
+        return db.query(NewsItem).outerjoin(Post).filter(
+            Post.id == None,
+            NewsItem.duplicate_of_id == None,
+            NewsItem.generation_batch_id == None,
+            NewsItem.published_at < cutoff
+        ).order_by(NewsItem.published_at.desc()).limit(settings.batch_max_items).all()
+
+    def _write_requests(self, news_items: List[NewsItem]) -> str:
+        """Write JSONL request file, returns its path"""
+        directory = os.path.join(settings.batch_dir, "requests")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl")
+
+        with open(path, "w", encoding="utf-8") as f:
+            for news_item in news_items:
+                request = post_generator.build_batch_request(
+                    custom_id=f"{CUSTOM_ID_PREFIX}{news_item.id}",
+                    title=news_item.title,
+                    summary=news_item.summary or news_item.title,
+                    url=news_item.url
+                )
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        return path
+
+    async def submit(self, db) -> Optional[GenerationBatch]:
+        """Submit a batch for older news without posts"""
+        news_items = self._pending_news(db)
+        if not news_items:
+            logger.info("No news for batch generation")
+            return None
+
+        backend = self.get_backend(settings.batch_backend)
+        path = self._write_requests(news_items)
+        try:
+            provider_batch_id, input_file_id = await backend.submit(path)
+        except Exception as e:
+            logger.error(f"Failed to submit generation batch: {e}")
+            return None
+
+        batch = GenerationBatch(
+            backend=backend.name,
+            provider_batch_id=provider_batch_id,
+            input_file_id=input_file_id,
+            request_count=len(news_items)
+        )
+        db.add(batch)
+        db.flush()
+        for news_item in news_items:
+            news_item.generation_batch_id = batch.id
+        db.commit()
+
+        logger.info(f"Submitted generation batch {provider_batch_id} with {len(news_items)} news")
+        return batch
+
+    def _apply_results(self, db, batch: GenerationBatch, output: str) -> int:
+        """Create posts from batch output, returns number of posts"""
+        post_status = self.get_backend(batch.backend).post_status
+        news_by_id = {news_item.id: news_item for news_item in batch.news_items}
+        created = 0
+
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            custom_id = result.get("custom_id") or ""
+            if not custom_id.startswith(CUSTOM_ID_PREFIX):
+                continue
+            news_item = news_by_id.get(int(custom_id[len(CUSTOM_ID_PREFIX):]))
+            if news_item is None:
+                continue
+
+            response = result.get("response") or {}
+            choices = (response.get("body") or {}).get("choices") or []
+            text = choices[0]["message"].get("content") if choices else None
+            if response.get("status_code") != 200 or not text:
+                logger.warning(f"No batch result for news {news_item.id}: {result.get('error')}")
+                continue
+
+            db.add(Post(news_id=news_item.id, generated_text=text.strip(), status=post_status))
+            del news_by_id[news_item.id]
+            created += 1
+
+        # News without a result go back to the queue
+        for news_item in news_by_id.values():
+            news_item.generation_batch_id = None
+        return created
+
+    async def poll(self, db) -> Dict[str, int]:
+        """Check running batches and collect finished ones"""
+        summary = {"running": 0, "completed": 0, "failed": 0, "posts": 0}
+        batches = db.query(GenerationBatch).filter(
+            GenerationBatch.status.in_(ACTIVE_STATUSES)
+        ).all()
+
+        for batch in batches:
+            try:
+                backend = self.get_backend(batch.backend)
+                state = await backend.retrieve(batch.provider_batch_id)
+                batch.status = state.status
+
+                if state.status == "completed":
+                    output = await backend.download(state.output_file_id) if state.output_file_id else ""
+                    created = self._apply_results(db, batch, output)
+                    batch.output_file_id = state.output_file_id
+                    batch.completed_count = created
+                    batch.completed_at = datetime.utcnow()
+                    summary["completed"] += 1
+                    summary["posts"] += created
+                    logger.info(f"Generation batch {batch.provider_batch_id} completed: {created} posts")
+                elif state.status in FAILED_STATUSES:
+                    batch.error_message = state.error
+                    batch.completed_at = datetime.utcnow()
+                    for news_item in batch.news_items:
+                        news_item.generation_batch_id = None
+                    summary["failed"] += 1
+                    logger.error(f"Generation batch {batch.provider_batch_id} {state.status}: {state.error}")
+                else:
+                    summary["running"] += 1
+
+                db.commit()
+            except Exception as e:
+                logger.error(f"Error polling generation batch {batch.id}: {e}")
+                db.rollback()
+
+        return summary
+
+
+# Global batch generator instance
+batch_generator = BatchGenerator()
@@ -0,0 +1,115 @@
+"""Content-addressed cache of OpenAI completions in Redis"""
+import json
+import logging
+import time
+from typing import Optional
+
+import redis
+
+from app.config import settings
+from app.redis_client import get_redis
+from app.utils import generate_hash
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return " ".join(text.split())
+
+
+class CompletionCache:
+    """Caches completions by a hash of model, prompts and parameters
+
+    Entries expire after `completion_cache_ttl` seconds. A sorted set keeps
+    the last access time of every entry, and the least recently used ones
+    are evicted once there are more than `completion_cache_max_entries`.
+    Redis errors are treated as misses.
+    """
+
+    key_prefix = "aibot:completion"
+
+    @property
+    def _lru_key(self) -> str:
+        return f"{self.key_prefix}:lru"
+
+    @property
+    def _stats_key(self) -> str:
+        return f"{self.key_prefix}:stats"
+
+    def _entry_key(self, digest: str) -> str:
+        return f"{self.key_prefix}:{digest}"
+
+    def make_key(self, model: str, system_prompt: str, prompt: str, **params) -> str:
+        """Hash of everything that affects the completion"""
+        payload = json.dumps(
+            {
+                "model": model,
+                "system": normalize_prompt(system_prompt),
+                "prompt": normalize_prompt(prompt),
+                "params": params,
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return generate_hash(payload)
+
+    def get(self, digest: str) -> Optional[str]:
+        """Get cached completion and mark it as recently used"""
+        if not settings.completion_cache_enabled:
+            return None
+        try:
+            r = get_redis()
+            value = r.get(self._entry_key(digest))
+            pipe = r.pipeline(transaction=False)
+            if value is None:
+                pipe.hincrby(self._stats_key, "misses", 1)
+                pipe.zrem(self._lru_key, digest)
+            else:
+                pipe.hincrby(self._stats_key, "hits", 1)
+                pipe.zadd(self._lru_key, {digest: time.time()})
+            pipe.execute()
+            return value
+        except redis.RedisError as e:
+            logger.warning(f"Completion cache unavailable: {e}")
+            return None
+
+    def set(self, digest: str, value: str):
+        """Store completion and evict least recently used entries"""
+        if not settings.completion_cache_enabled:
+            return
+        try:
+            r = get_redis()
+            pipe = r.pipeline(transaction=False)
+            pipe.set(self._entry_key(digest), value, ex=settings.completion_cache_ttl)
+            pipe.zadd(self._lru_key, {digest: time.time()})
+            pipe.zcard(self._lru_key)
+            size = pipe.execute()[-1]
+
+            excess = size - settings.completion_cache_max_entries
+            if excess > 0:
+                evicted = [member for member, _ in r.zpopmin(self._lru_key, excess)]
+                r.delete(*[self._entry_key(member) for member in evicted])
+        except redis.RedisError as e:
+            logger.warning(f"Failed to store completion in cache: {e}")
+
+    def stats(self) -> dict:
+        """Hit/miss counters and number of cached entries"""
+        try:
+            r = get_redis()
+            counters = r.hgetall(self._stats_key)
+            hits = int(counters.get("hits", 0))
+            misses = int(counters.get("misses", 0))
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "entries": r.zcard(self._lru_key),
+            }
+        except redis.RedisError as e:
+            logger.warning(f"Completion cache unavailable: {e}")
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0}
+
+
+# Global completion cache instance
+completion_cache = CompletionCache()
@@ -1,64 +1,239 @@
 """AI post generator"""
+import asyncio
+import json
 import logging
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from app.ai.openai_client import openai_client
+from app.ai.openai_client import SYSTEM_PROMPT, openai_client
+from app.ai.prompt_builder import prompt_builder
+from app.ai.router import model_router
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Telegram rejects longer messages
+TELEGRAM_MESSAGE_LIMIT = 4096
+
 
 class PostGenerator:
     """Generate attractive Telegram posts from news"""
 
+    max_tokens = 500
+    temperature = 0.7
+
     def __init__(self):
         self.client = openai_client
 
     def _create_prompt(self, title: str, summary: str, url: str) -> str:
         """Create prompt for AI post generation"""
-        prompt = f"""
-Создай привлекательный пост для Telegram-канала на основе этой новости:
+        return prompt_builder.post_prompt(title, summary, url).text
 
-Заголовок: {title}
-Описание: {summary}
-Ссылка для подробностей: {url}
+    def _create_pack_prompt(self, news_items: Sequence) -> str:
+        """Create prompt asking for posts for several news items as a JSON array"""
+        return prompt_builder.pack_prompt(news_items).text
 
-Требования:
-- Длина 150-300 символов
-- 1-2 эмодзи для привлечения внимания
-- Краткое изложение сути новости
-- Призыв к действию (прочитать, узнать больше и т.д.)
-- Используй форматирование Markdown для ссылок
+    def _parse_pack(self, response: Optional[str], news_ids: Sequence[int]) -> Dict[int, str]:
+        """Posts by news id from a JSON array response, invalid entries are skipped"""
+        response = (response or "").strip()
+        # Cut off a Markdown code fence the model may add anyway
+        start, end = response.find("["), response.rfind("]")
+        if start == -1 or end < start:
+            logger.warning("No JSON array in packed generation response")
+            return {}
 
-Важно: пост должен быть строго по теме этой новости, не выдумывай другие факты.
-"""
-        return prompt
+        try:
+            entries = json.loads(response[start:end + 1])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON in packed generation response: {e}")
+            return {}
+
+        posts = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get("post"), str):
+                continue
+            try:
+                news_id = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if news_id in news_ids and news_id not in posts:
+                posts[news_id] = entry["post"]
+        return posts
+
+    def _validate_post(self, title: str, post_text: Optional[str]) -> Optional[str]:
+        """Clean up generated text, None if it can't be published"""
+        post_text = (post_text or "").strip()
+        if not post_text:
+            logger.warning(f"Failed to generate post for: {title[:50]}...")
+            return None
+        if len(post_text) > TELEGRAM_MESSAGE_LIMIT:
+            logger.warning(f"Generated post is too long ({len(post_text)} chars) for: {title[:50]}...")
+            return None
+
+        logger.info(f"Generated post for: {title[:50]}...")
+        return post_text
 
     async def generate_post(
         self,
         title: str,
         summary: str,
-        url: str
+        url: str,
+        model: Optional[str] = None
+    ) -> Optional[str]:
+        """Generate post from news item, the model is routed when not given"""
+        return await self._generate_post(title, summary, url, model, stream=False)
+
+    async def generate_post_streaming(
+        self,
+        title: str,
+        summary: str,
+        url: str,
+        model: Optional[str] = None
+    ) -> Optional[str]:
+        """Generate post from news item, assembling it from streamed chunks"""
+        return await self._generate_post(title, summary, url, model, stream=True)
+
+    async def _generate_post(
+        self,
+        title: str,
+        summary: str,
+        url: str,
+        model: Optional[str],
+        stream: bool
     ) -> Optional[str]:
-        """Generate post from news item"""
         try:
             prompt = self._create_prompt(title, summary, url)
-            post_text = await self.client.generate_completion(
+            used_model, post_text = await model_router.generate(
                 prompt=prompt,
-                max_tokens=500,
-                temperature=0.7
+                model=model or model_router.select(summary),
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=stream
             )
 
-            if post_text:
-                logger.info(f"Generated post for: {title[:50]}...")
-                return post_text.strip()
-
-            logger.warning(f"Failed to generate post for: {title[:50]}...")
-            return None
+            # Validated right after the last chunk, the caller publishes it immediately
+            post_text = self._validate_post(title, post_text)
+            model_router.record_post(used_model, post_text)
+            return post_text
 
         except Exception as e:
             logger.error(f"Error generating post: {e}")
             return None
 
+    def build_batch_request(self, custom_id: str, title: str, summary: str, url: str) -> dict:
+        """Batch API request line with the same prompt and parameters as generate_post"""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.client.model,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": self._create_prompt(title, summary, url)}
+                ],
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+            },
+        }
+
+    async def generate_pack(
+        self,
+        news_items: Sequence,
+        model: Optional[str] = None
+    ) -> Tuple[List[Tuple[object, str]], List[object]]:
+        """Generate posts for several news items in one request
+
+        Returns generated posts and news items that need a single-item call.
+        """
+        try:
+            used_model, response = await model_router.generate(
+                prompt=self._create_pack_prompt(news_items),
+                model=model or model_router.select_pack(
+                    [model_router.select(news_item.summary) for news_item in news_items]
+                ),
+                max_tokens=self.max_tokens * len(news_items),
+                temperature=self.temperature
+            )
+        except Exception as e:
+            logger.error(f"Error generating packed posts: {e}")
+            return [], list(news_items)
+
+        posts = self._parse_pack(response, [news_item.id for news_item in news_items])
+        generated, failed = [], []
+        for news_item in news_items:
+            post_text = self._validate_post(news_item.title, posts[news_item.id]) if news_item.id in posts else None
+            model_router.record_post(used_model, post_text)
+            if post_text:
+                generated.append((news_item, post_text))
+            else:
+                failed.append(news_item)
+
+        if failed:
+            logger.info(f"Packed generation: {len(generated)} posts, {len(failed)} items fall back to single calls")
+        return generated, failed
+
+    async def generate_posts(
+        self,
+        news_items: Sequence,
+        priorities: Optional[Dict[int, float]] = None
+    ) -> AsyncIterator[Tuple[object, Optional[str]]]:
+        """Generate posts for news items concurrently, yielding them as they complete
+
+        Concurrency is bounded by the OpenAI rate limiter, not by this method.
+        The model is routed per item by summary, source and `priorities`
+        (ranking scores by news id). With `generation_streaming` posts are
+        streamed, so each one is handed to the caller as soon as its last
+        token arrives. Only non-streamed requests can be hedged, so
+        `openai_hedging_enabled` turns streaming off. With `generation_pack_size` > 1 news items routed to
+        the same model are packed into shared requests, items missing from a
+        packed response are generated one by one.
+        """
+        priorities = priorities or {}
+        streaming = settings.generation_streaming and not settings.openai_hedging_enabled
+        generate_post = self.generate_post_streaming if streaming else self.generate_post
+
+        by_model: Dict[str, list] = {}
+        for news_item in news_items:
+            model = model_router.select(
+                news_item.summary,
+                source=getattr(news_item, "source", None),
+                priority=priorities.get(news_item.id)
+            )
+            by_model.setdefault(model, []).append(news_item)
+
+        async def generate(news_item, model):
+            text = await generate_post(
+                title=news_item.title,
+                summary=news_item.summary or news_item.title,
+                url=news_item.url,
+                model=model
+            )
+            return [(news_item, text)], [], model
+
+        async def generate_pack(pack, model):
+            generated, failed = await self.generate_pack(pack, model)
+            return generated, failed, model
+
+        pack_size = max(settings.generation_pack_size, 1)
+        tasks = set()
+        for model, items in by_model.items():
+            for i in range(0, len(items), pack_size):
+                pack = items[i:i + pack_size]
+                tasks.add(asyncio.create_task(
+                    generate_pack(pack, model) if len(pack) > 1 else generate(pack[0], model)
+                ))
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    generated, failed, model = task.result()
+                    for result in generated:
+                        yield result
+                    tasks.update(asyncio.create_task(generate(news_item, model)) for news_item in failed)
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def test_generation(self, test_title: str = "Тестовая новость"):
         """Test post generation with sample data"""
         sample_summary = "Это тестовая новость для проверки работы AI-генератора."
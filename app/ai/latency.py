@@ -0,0 +1,74 @@
+"""Latency samples of the generation pipeline"""
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import redis
+
+from app.config import settings
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Time to first streamed token of an OpenAI call
+TIME_TO_FIRST_TOKEN = "time_to_first_token"
+# Full OpenAI call, from request to last token
+COMPLETION = "completion"
+# From storing a news item to publishing its post
+FETCH_TO_PUBLISH = "fetch_to_publish"
+
+METRICS = (TIME_TO_FIRST_TOKEN, COMPLETION, FETCH_TO_PUBLISH)
+
+
+class LatencyTracker:
+    """Keeps the last `latency_window` samples per metric in Redis
+
+    Samples are shared by all workers, so percentiles reported by the API
+    cover every generation run. Redis errors only lose samples.
+    """
+
+    key_prefix = "aibot:latency"
+
+    def _key(self, metric: str) -> str:
+        return f"{self.key_prefix}:{metric}"
+
+    def record(self, metric: str, seconds: float):
+        """Store one sample"""
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.lpush(self._key(metric), round(seconds, 4))
+            pipe.ltrim(self._key(metric), 0, settings.latency_window - 1)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record {metric} latency: {e}")
+
+    def percentile(self, metric: str, q: float) -> Optional[float]:
+        """Percentile of stored samples in seconds, None without samples"""
+        try:
+            samples = np.array(get_redis().lrange(self._key(metric), 0, -1), dtype=np.float64)
+        except redis.RedisError as e:
+            logger.warning(f"Latency samples unavailable: {e}")
+            return None
+        return float(np.percentile(samples, q)) if samples.size else None
+
+    def stats(self) -> Dict[str, dict]:
+        """Sample count, p50 and p95 in seconds per metric"""
+        result = {metric: {"count": 0, "p50": None, "p95": None} for metric in METRICS}
+        try:
+            r = get_redis()
+            for metric in METRICS:
+                samples = np.array(r.lrange(self._key(metric), 0, -1), dtype=np.float64)
+                if samples.size:
+                    p50, p95 = np.percentile(samples, [50, 95])
+                    result[metric] = {
+                        "count": int(samples.size),
+                        "p50": round(float(p50), 3),
+                        "p95": round(float(p95), 3),
+                    }
+        except redis.RedisError as e:
+            logger.warning(f"Latency stats unavailable: {e}")
+        return result
+
+
+# Global latency tracker instance
+latency_tracker = LatencyTracker()
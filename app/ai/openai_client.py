@@ -1,50 +1,340 @@
 """OpenAI API client"""
+import asyncio
 import logging
-from typing import Optional
+import random
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
-from openai import AsyncOpenAI, OpenAIError
+import httpx
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAIError,
+    RateLimitError,
+)
 
+from app.ai.completion_cache import completion_cache
+from app.ai.latency import COMPLETION, TIME_TO_FIRST_TOKEN, latency_tracker
+from app.ai.prompt_builder import token_counter
+from app.ai.rate_limiter import rate_limiter
 from app.config import settings
+from app.news_parser.politeness import parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are a professional content writer for a Telegram channel."
+
 
 class OpenAIClient:
-    """OpenAI API client wrapper"""
+    """OpenAI API client wrapper
+
+    Every call has a deadline of `openai_call_budget` seconds that covers
+    all attempts. Timeouts, 5xx and 429 are retried with exponential
+    backoff and full jitter while the deadline allows. The deadline also
+    bounds waiting for the rate limiter and reading a stream. With
+    `openai_hedging_enabled` a non-streamed request still running after the
+    p95 completion time gets a second copy, and the first answer wins.
+    Streams are not hedged, so hedging turns generator streaming off.
+    Hedges are capped at `openai_hedge_max_ratio` of calls and skipped for
+    large requests or when the rate limiter is saturated.
+    """
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
-        self.model = "gpt-4"
+        # Retries are done here so the rate limiter sees every 429
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=0,
+            timeout=settings.openai_timeout
+        )
+        self.model = settings.openai_model
+        self.stats = {"calls": 0, "retries": 0, "hedged": 0, "hedge_wins": 0, "budget_exhausted": 0}
+        self._hedge_delay: Optional[float] = None
+        self._hedge_delay_at = float("-inf")
+
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> Optional[float]:
+        """Delay requested by a 429 response, in seconds"""
+        headers = error.response.headers
+        retry_after_ms = parse_retry_after(headers.get("retry-after-ms"))
+        if retry_after_ms is not None:
+            return retry_after_ms / 1000
+        return parse_retry_after(headers.get("retry-after"))
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        """Request timeout that keeps the attempt within the call deadline"""
+        return max(min(settings.openai_timeout, deadline - time.monotonic()), 1.0)
+
+    def _deadline_exceeded(self) -> APITimeoutError:
+        """Error for a call that ran out of `openai_call_budget`"""
+        self.stats["budget_exhausted"] += 1
+        logger.error("OpenAI call budget exhausted")
+        return APITimeoutError(request=httpx.Request("POST", self.client.base_url.join("chat/completions")))
+
+    async def _backoff(self, attempt: int, max_retries: int, deadline: float, error: Exception):
+        """Sleep before the next attempt, re-raise if no attempts or time are left"""
+        if attempt >= max_retries:
+            logger.error(f"OpenAI API error: {error}")
+            raise error
+
+        delay = random.uniform(0, min(settings.openai_backoff_max, settings.openai_backoff_base * 2 ** attempt))
+        if time.monotonic() + delay >= deadline:
+            self.stats["budget_exhausted"] += 1
+            logger.error(f"OpenAI call budget exhausted: {error}")
+            raise error
+
+        self.stats["retries"] += 1
+        logger.warning(f"OpenAI request failed ({type(error).__name__}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    def _get_hedge_delay(self) -> Optional[float]:
+        """p95 completion time, refreshed once a minute, None until there are samples"""
+        now = time.monotonic()
+        if now - self._hedge_delay_at > 60:
+            p95 = latency_tracker.percentile(COMPLETION, 95)
+            self._hedge_delay = max(p95, settings.openai_hedge_min_delay) if p95 is not None else None
+            self._hedge_delay_at = now
+        return self._hedge_delay
+
+    def _may_hedge(self, tokens: int) -> bool:
+        """Whether a hedged request fits the cost caps right now"""
+        if not settings.openai_hedging_enabled or tokens > settings.openai_hedge_max_tokens:
+            return False
+        if self.stats["hedged"] + 1 > settings.openai_hedge_max_ratio * self.stats["calls"]:
+            return False
+        # A saturated limiter means the hedge would only queue behind the original
+        return rate_limiter.paused_until <= time.monotonic() and rate_limiter.in_flight < int(rate_limiter.limit)
+
+    async def _hedged(self, request: Callable[[], Awaitable[Any]], delay: float, tokens: int) -> Any:
+        """Run request, adding a second copy if the first takes longer than `delay`"""
+        primary = asyncio.create_task(request())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._may_hedge(tokens):
+                self.stats["hedged"] += 1
+                logger.info(f"OpenAI request slower than {delay:.1f}s, sending a hedged request")
+                tasks.add(asyncio.create_task(request()))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # The loser is cancelled, its rate limiter permit is released
+            for task in tasks:
+                task.cancel()
+
+    async def _create(
+        self,
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        tokens: int,
+        deadline: float
+    ):
+        """Single chat completion request under the rate limiter
+
+        Waiting for the limiter counts against the deadline.
+        """
+        # httpx timeouts are per read, the whole attempt must fit the deadline
+        async with asyncio.timeout(deadline - time.monotonic()):
+            async with rate_limiter.acquire(tokens) as permit:
+                started = time.monotonic()
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        timeout=self._attempt_timeout(deadline)
+                    )
+                except RateLimitError as e:
+                    rate_limiter.on_throttled(self._retry_after(e))
+                    raise
+                if response.usage:
+                    permit.used_tokens = response.usage.total_tokens
+
+        latency_tracker.record(COMPLETION, time.monotonic() - started)
+        rate_limiter.on_success()
+        return response
 
     async def generate_completion(
         self,
         prompt: str,
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        use_cache: bool = True,
+        model: Optional[str] = None,
+        max_retries: Optional[int] = None
     ) -> Optional[str]:
-        """Generate text completion using OpenAI API"""
+        """Generate text completion using OpenAI API
+
+        Identical requests are answered from the completion cache.
+        """
+        model = model or self.model
+        max_retries = settings.openai_max_retries if max_retries is None else max_retries
+        cache_key = completion_cache.make_key(
+            model, SYSTEM_PROMPT, prompt,
+            max_tokens=max_tokens, temperature=temperature
+        )
+        if use_cache:
+            cached = completion_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Completion cache hit {cache_key[:12]}")
+                return cached
+
+        tokens = token_counter.count(SYSTEM_PROMPT + prompt) + max_tokens
+        deadline = time.monotonic() + settings.openai_call_budget
+        self.stats["calls"] += 1
+
+        for attempt in range(max_retries + 1):
+            try:
+                def request():
+                    return self._create(model, prompt, max_tokens, temperature, tokens, deadline)
+
+                hedge_delay = self._get_hedge_delay() if settings.openai_hedging_enabled else None
+                if hedge_delay is not None and self._may_hedge(tokens):
+                    response = await self._hedged(request, hedge_delay, tokens)
+                else:
+                    response = await request()
+
+                if response.choices:
+                    content = response.choices[0].message.content
+                    if content and use_cache:
+                        completion_cache.set(cache_key, content)
+                    return content
+
+                return None
+
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                await self._backoff(attempt, max_retries, deadline, e)
+            except TimeoutError:
+                raise self._deadline_exceeded() from None
+            except OpenAIError as e:
+                logger.error(f"OpenAI API error: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Unexpected error in OpenAI completion: {e}")
+                raise
+
+    @staticmethod
+    async def _read_stream(stream, deadline: float) -> AsyncIterator[str]:
+        """Content chunks of a stream, raises TimeoutError at the deadline
+
+        Each read is bounded separately, so the timeout never spans a yield
+        to the caller. openai does not wrap errors raised while reading a
+        stream, so transport failures are re-raised as its connection errors.
+        """
+        chunks = stream.__aiter__()
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional content writer for a Telegram channel."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-
-            if response.choices:
-                return response.choices[0].message.content
-
-            return None
-
-        except OpenAIError as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error in OpenAI completion: {e}")
-            raise
+            while True:
+                try:
+                    async with asyncio.timeout(deadline - time.monotonic()):
+                        chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    return
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    yield content
+        except httpx.TimeoutException as e:
+            raise APITimeoutError(request=stream.response.request) from e
+        except httpx.TransportError as e:
+            raise APIConnectionError(request=stream.response.request) from e
+
+    async def stream_completion(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        use_cache: bool = True,
+        model: Optional[str] = None,
+        max_retries: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Generate text completion, yielding content chunks as they arrive
+
+        A cached completion is yielded as one chunk. Failed requests are
+        retried only until the first chunk, a broken stream is re-raised.
+        Time to first token and total call time go to the latency tracker.
+        The whole stream, including the wait for the rate limiter, is bounded
+        by the call deadline. Streams are not hedged: the rate limiter permit
+        spans the whole stream.
+        """
+        model = model or self.model
+        max_retries = settings.openai_max_retries if max_retries is None else max_retries
+        cache_key = completion_cache.make_key(
+            model, SYSTEM_PROMPT, prompt,
+            max_tokens=max_tokens, temperature=temperature
+        )
+        if use_cache:
+            cached = completion_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Completion cache hit {cache_key[:12]}")
+                yield cached
+                return
+
+        tokens = token_counter.count(SYSTEM_PROMPT + prompt) + max_tokens
+        deadline = time.monotonic() + settings.openai_call_budget
+        self.stats["calls"] += 1
+        chunks = []
+
+        for attempt in range(max_retries + 1):
+            try:
+                # The permit spans the stream, only getting it and the response is timed here
+                async with AsyncExitStack() as stack:
+                    async with asyncio.timeout(deadline - time.monotonic()):
+                        permit = await stack.enter_async_context(rate_limiter.acquire(tokens))
+                        started = time.monotonic()
+                        stream = await self.client.chat.completions.create(
+                            model=model,
+                            messages=[
+                                {"role": "system", "content": SYSTEM_PROMPT},
+                                {"role": "user", "content": prompt}
+                            ],
+                            max_tokens=max_tokens,
+                            temperature=temperature,
+                            stream=True,
+                            timeout=self._attempt_timeout(deadline)
+                        )
+                    async for content in self._read_stream(stream, deadline):
+                        if not chunks:
+                            latency_tracker.record(TIME_TO_FIRST_TOKEN, time.monotonic() - started)
+                        chunks.append(content)
+                        yield content
+
+                    # Streamed responses carry no usage, count the output instead
+                    permit.used_tokens = token_counter.count(SYSTEM_PROMPT + prompt + "".join(chunks))
+
+                latency_tracker.record(COMPLETION, time.monotonic() - started)
+                rate_limiter.on_success()
+
+                if chunks and use_cache:
+                    completion_cache.set(cache_key, "".join(chunks))
+                return
+
+            except RateLimitError as e:
+                rate_limiter.on_throttled(self._retry_after(e))
+                # A partly delivered stream can't be resumed
+                await self._backoff(max_retries if chunks else attempt, max_retries, deadline, e)
+            except (APIConnectionError, InternalServerError) as e:
+                await self._backoff(max_retries if chunks else attempt, max_retries, deadline, e)
+            except TimeoutError:
+                raise self._deadline_exceeded() from None
+            except OpenAIError as e:
+                logger.error(f"OpenAI API error: {e}")
+                raise
 
 
 # Global client instance
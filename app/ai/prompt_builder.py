@@ -0,0 +1,155 @@
+"""Token-budgeted prompts for post generation"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from app.ai.rate_limiter import estimate_tokens
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+ELLIPSIS = "…"
+
+POST_REQUIREMENTS = """- Длина 150-300 символов
+- 1-2 эмодзи для привлечения внимания
+- Краткое изложение сути новости
+- Призыв к действию (прочитать, узнать больше и т.д.)
+- Используй форматирование Markdown для ссылок"""
+
+# Static prefixes go first and never change, so provider-side prompt caching can reuse them
+POST_PROMPT_PREFIX = f"""Создай привлекательный пост для Telegram-канала на основе новости ниже.
+
+Требования:
+{POST_REQUIREMENTS}
+
+Важно: пост должен быть строго по теме этой новости, не выдумывай другие факты.
+
+"""
+
+PACK_PROMPT_PREFIX = f"""Создай привлекательные посты для Telegram-канала на основе новостей ниже, по одному посту на каждую новость.
+
+Требования к каждому посту:
+{POST_REQUIREMENTS}
+
+Важно: каждый пост должен быть строго по теме своей новости, не выдумывай другие факты.
+
+Ответь только JSON-массивом без пояснений и блоков кода, по одному объекту на новость:
+[{{"id": <номер новости>, "post": "<текст поста>"}}]
+
+"""
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken, or estimates them if it is unavailable
+
+    tiktoken downloads its vocabulary on first use, so an offline worker
+    also falls back to the estimate.
+    """
+
+    def __init__(self):
+        self._encoding = None
+        self._loaded = False
+
+    @property
+    def encoding(self):
+        if not self._loaded:
+            self._loaded = True
+            try:
+                import tiktoken
+                self._encoding = tiktoken.encoding_for_model(settings.openai_model)
+            except ImportError:
+                logger.warning("tiktoken is not installed, estimating prompt tokens")
+            except Exception as e:
+                logger.warning(f"Failed to load tiktoken encoding, estimating prompt tokens: {e}")
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return estimate_tokens(text)
+        return len(self.encoding.encode(text))
+
+    def cut(self, text: str, max_tokens: int) -> str:
+        """First `max_tokens` tokens of text"""
+        if self.encoding is None:
+            return text[:max(max_tokens - 1, 0) * 2]
+        return self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Trim text to `max_tokens` on a sentence boundary
+
+        A first sentence longer than the budget is cut mid-sentence.
+        """
+        if self.count(text) <= max_tokens:
+            return text
+
+        budget = max_tokens - self.count(ELLIPSIS)
+        kept: List[str] = []
+        for sentence in SENTENCE_END.split(text):
+            if self.count(" ".join(kept + [sentence])) > budget:
+                break
+            kept.append(sentence)
+
+        if kept:
+            return " ".join(kept)
+        return self.cut(text, budget).rstrip() + ELLIPSIS
+
+
+@dataclass
+class Prompt:
+    """Built prompt with its size"""
+    text: str
+    tokens: int
+    truncated: bool
+
+
+class PromptBuilder:
+    """Builds generation prompts within `prompt_*_max_tokens` per field
+
+    Prompts are the static prefix followed by the news fields, so input
+    tokens per item are bounded by the prefix plus the field budgets.
+    """
+
+    def __init__(self, counter: Optional[TokenCounter] = None):
+        self.counter = counter or TokenCounter()
+        self.stats = {"prompts": 0, "tokens": 0, "max_tokens": 0, "truncated": 0}
+
+    def _news_block(self, title: str, summary: str, url: str) -> Tuple[str, bool]:
+        short_title = self.counter.truncate(title, settings.prompt_title_max_tokens)
+        short_summary = self.counter.truncate(summary, settings.prompt_summary_max_tokens)
+        block = f"""Заголовок: {short_title}
+Описание: {short_summary}
+Ссылка для подробностей: {url}"""
+        return block, short_title != title or short_summary != summary
+
+    def _finish(self, text: str, truncated: bool) -> Prompt:
+        prompt = Prompt(text=text, tokens=self.counter.count(text), truncated=truncated)
+        self.stats["prompts"] += 1
+        self.stats["tokens"] += prompt.tokens
+        self.stats["max_tokens"] = max(self.stats["max_tokens"], prompt.tokens)
+        self.stats["truncated"] += int(truncated)
+        logger.debug(f"Prompt: {prompt.tokens} tokens{' (truncated)' if truncated else ''}")
+        return prompt
+
+    def post_prompt(self, title: str, summary: str, url: str) -> Prompt:
+        """Prompt for one post"""
+        block, truncated = self._news_block(title, summary, url)
+        return self._finish(POST_PROMPT_PREFIX + block + "\n", truncated)
+
+    def pack_prompt(self, news_items: Sequence) -> Prompt:
+        """Prompt for posts for several news items as a JSON array"""
+        blocks = []
+        truncated = False
+        for news_item in news_items:
+            block, item_truncated = self._news_block(
+                news_item.title, news_item.summary or news_item.title, news_item.url
+            )
+            blocks.append(f"Новость {news_item.id}:\n{block}")
+            truncated = truncated or item_truncated
+        return self._finish(PACK_PROMPT_PREFIX + "\n\n".join(blocks) + "\n", truncated)
+
+
+# Global token counter and prompt builder instances
+token_counter = TokenCounter()
+prompt_builder = PromptBuilder(token_counter)
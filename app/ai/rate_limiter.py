@@ -0,0 +1,148 @@
+"""Adaptive concurrency and rate limiter for OpenAI requests"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, Cyrillic text takes about one token per 2-3 characters"""
+    return len(text) // 2 + 1
+
+
+class Permit:
+    """Reservation for one request, the caller may report actual token usage"""
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.used_tokens: Optional[int] = None
+
+
+class AdaptiveRateLimiter:
+    """Limits OpenAI calls by requests/tokens per minute and concurrency
+
+    Requests and tokens are taken from token buckets refilled at
+    `openai_rpm_limit` and `openai_tpm_limit` per minute. The number of
+    concurrent requests follows AIMD: it grows by one per window of
+    successful requests and halves on every 429, which also pauses new
+    requests for the Retry-After delay.
+    """
+
+    def __init__(self):
+        self.limit = float(settings.openai_initial_concurrency)
+        self.in_flight = 0
+        self.requests = float(settings.openai_rpm_limit)
+        self.tokens = float(settings.openai_tpm_limit)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.completed = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Condition bound to the running loop, each Celery task runs its own loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self.in_flight = 0
+        return self._condition
+
+    def _refill(self, now: float):
+        """Add request and token budget accumulated since last update"""
+        elapsed = now - self.updated_at
+        self.requests = min(
+            float(settings.openai_rpm_limit),
+            self.requests + elapsed * settings.openai_rpm_limit / 60
+        )
+        self.tokens = min(
+            float(settings.openai_tpm_limit),
+            self.tokens + elapsed * settings.openai_tpm_limit / 60
+        )
+        self.updated_at = now
+
+    def _wait_time(self, tokens: int, now: float) -> Optional[float]:
+        """Seconds until the request fits the budgets, None if only concurrency is missing"""
+        wait = max(
+            self.paused_until - now,
+            (1 - self.requests) * 60 / settings.openai_rpm_limit,
+            (tokens - self.tokens) * 60 / settings.openai_tpm_limit,
+        )
+        if wait > 0:
+            return wait
+        return None if self.in_flight >= int(self.limit) else 0.0
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int) -> AsyncIterator[Permit]:
+        """Wait for a free slot and budget for a request of `tokens` tokens"""
+        # A request larger than the whole bucket would wait forever
+        tokens = min(tokens, settings.openai_tpm_limit)
+        condition = self._get_condition()
+
+        async with condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(tokens, now)
+                if wait == 0.0:
+                    break
+                try:
+                    # Woken up early when another request finishes
+                    await asyncio.wait_for(condition.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            self.requests -= 1
+            self.tokens -= tokens
+            self.in_flight += 1
+
+        permit = Permit(tokens)
+        try:
+            yield permit
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                if permit.used_tokens is not None:
+                    # Return the unused part of the estimate
+                    self.tokens = min(
+                        float(settings.openai_tpm_limit),
+                        self.tokens + permit.tokens - permit.used_tokens
+                    )
+                condition.notify_all()
+
+    def on_success(self):
+        """Additive increase: one more concurrent request per window of successes"""
+        self.completed += 1
+        self.limit = min(
+            float(settings.openai_max_concurrency),
+            self.limit + 1 / max(self.limit, 1.0)
+        )
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease after a 429"""
+        self.throttled += 1
+        self.limit = max(float(settings.openai_min_concurrency), self.limit / 2)
+        delay = retry_after if retry_after is not None else settings.openai_throttle_pause
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        logger.warning(
+            f"OpenAI rate limited: concurrency {self.limit:.1f}, paused for {delay:.1f}s"
+        )
+
+    def stats(self) -> dict:
+        """Current limiter state"""
+        return {
+            "concurrency": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "throttled": self.throttled,
+        }
+
+
+# Global limiter instance
+rate_limiter = AdaptiveRateLimiter()
@@ -0,0 +1,189 @@
+"""Per-item model selection and fallback between OpenAI models"""
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import redis
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from app.ai.openai_client import openai_client
+from app.config import settings
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the next model in the cascade is tried, timeouts are APIConnectionError
+FALLBACK_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+class ModelRouter:
+    """Routes generation requests between a fast and a premium model
+
+    The premium model (`openai_model`) gets news with long summaries, from
+    `routing_premium_sources` or ranked at least `routing_premium_min_score`,
+    while its daily request budget lasts. Everything else goes to
+    `routing_fast_model`. A request failing with a timeout, 5xx or 429
+    falls back to the other model, to the premium one only within its
+    daily budget. Per-model counters live in Redis.
+    """
+
+    key_prefix = "aibot:models"
+
+    def _stats_key(self, model: str) -> str:
+        return f"{self.key_prefix}:stats:{model}"
+
+    def _budget_key(self) -> str:
+        return f"{self.key_prefix}:premium:{datetime.utcnow():%Y-%m-%d}"
+
+    def _incr(self, model: str, **counters):
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for field, amount in counters.items():
+                pipe.hincrbyfloat(self._stats_key(model), field, amount)
+            pipe.sadd(f"{self.key_prefix}:known", model)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record model stats: {e}")
+
+    def premium_budget_left(self) -> bool:
+        """Whether premium requests are still allowed today"""
+        try:
+            used = int(get_redis().get(self._budget_key()) or 0)
+        except redis.RedisError:
+            return True
+        return used < settings.routing_premium_daily_limit
+
+    def _use_premium_budget(self):
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.incr(self._budget_key())
+            pipe.expire(self._budget_key(), 2 * 24 * 3600)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to count premium request: {e}")
+
+    def select(
+        self,
+        summary: Optional[str],
+        source: Optional[str] = None,
+        priority: Optional[float] = None
+    ) -> str:
+        """Pick the model for one news item"""
+        if not settings.routing_enabled:
+            return settings.openai_model
+
+        needs_premium = (
+            len(summary or "") >= settings.routing_premium_min_summary_chars
+            or (source is not None and source in settings.routing_premium_sources)
+            or (priority is not None and priority >= settings.routing_premium_min_score)
+        )
+        if needs_premium and self.premium_budget_left():
+            return settings.openai_model
+        return settings.routing_fast_model
+
+    def select_pack(self, models: Sequence[str]) -> str:
+        """Model for a packed request, premium if any item needs it"""
+        return settings.openai_model if settings.openai_model in models else settings.routing_fast_model
+
+    def cascade(self, model: str) -> List[str]:
+        """Selected model followed by the fallback
+
+        The premium model is a fallback only while its daily budget lasts.
+        """
+        if not settings.routing_enabled:
+            return [model]
+        fallbacks = [settings.routing_fast_model]
+        if self.premium_budget_left():
+            fallbacks.append(settings.openai_model)
+        return [model] + [m for m in fallbacks if m != model]
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        stream: bool = False
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Generate completion, falling back along the cascade
+
+        Returns the model that answered and the text.
+        """
+        models = self.cascade(model)
+        for position, current in enumerate(models):
+            is_last = position == len(models) - 1
+            if current == settings.openai_model and current != settings.routing_fast_model:
+                self._use_premium_budget()
+
+            started = time.monotonic()
+            try:
+                # Fall back at once instead of retrying a struggling model
+                max_retries = None if is_last else 0
+                if stream:
+                    chunks = []
+                    async for chunk in openai_client.stream_completion(
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        model=current,
+                        max_retries=max_retries
+                    ):
+                        chunks.append(chunk)
+                    text = "".join(chunks)
+                else:
+                    text = await openai_client.generate_completion(
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        model=current,
+                        max_retries=max_retries
+                    )
+            except FALLBACK_ERRORS as e:
+                self._incr(current, requests=1, errors=1, latency=time.monotonic() - started)
+                if is_last:
+                    raise
+                self._incr(current, fallbacks=1)
+                logger.warning(f"Model {current} failed ({type(e).__name__}), falling back to {models[position + 1]}")
+                continue
+
+            self._incr(current, requests=1, latency=time.monotonic() - started)
+            return current, text
+
+        return None, None
+
+    def record_post(self, model: Optional[str], post_text: Optional[str]):
+        """Quality signal: whether the model's output passed post validation"""
+        if model is None:
+            return
+        if post_text:
+            self._incr(model, posts=1, post_chars=len(post_text))
+        else:
+            self._incr(model, rejected=1)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-model request, error, fallback and quality counters"""
+        result = {}
+        try:
+            r = get_redis()
+            for model in sorted(r.smembers(f"{self.key_prefix}:known")):
+                counters = {k: float(v) for k, v in r.hgetall(self._stats_key(model)).items()}
+                requests = counters.get("requests", 0)
+                posts = counters.get("posts", 0)
+                checked = posts + counters.get("rejected", 0)
+                result[model] = {
+                    "requests": int(requests),
+                    "errors": int(counters.get("errors", 0)),
+                    "fallbacks": int(counters.get("fallbacks", 0)),
+                    "avg_latency": round(counters.get("latency", 0) / requests, 3) if requests else None,
+                    "posts": int(posts),
+                    "rejection_rate": round(counters.get("rejected", 0) / checked, 3) if checked else 0.0,
+                    "avg_post_chars": round(counters.get("post_chars", 0) / posts) if posts else None,
+                }
+        except redis.RedisError as e:
+            logger.warning(f"Model stats unavailable: {e}")
+        return result
+
+
+# Global model router instance
+model_router = ModelRouter()
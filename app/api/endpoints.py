@@ -1,11 +1,17 @@
 """API endpoints"""
-from typing import List
+from typing import Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.ai.completion_cache import completion_cache
+from app.ai.latency import latency_tracker
+from app.ai.router import model_router
 from app.api import schemas
+from app.config_cache import config_cache
 from app.models import Keyword, NewsItem, Post, Source, get_db
+from app.news_parser.circuit_breaker import circuit_breaker
+from app.ranking import ranking_engine
 
 router = APIRouter()
 
@@ -18,6 +24,36 @@ def get_sources(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     return sources
 
 
+@router.get("/sources/breakers", response_model=List[schemas.SourceBreakerResponse])
+def get_source_breakers(db: Session = Depends(get_db)):
+    """Get circuit breaker state of all sources"""
+    sources = db.query(Source).order_by(Source.id).all()
+    return [
+        schemas.SourceBreakerResponse(
+            source_id=source.id,
+            name=source.name,
+            **circuit_breaker.status(source.id)
+        )
+        for source in sources
+    ]
+
+
+@router.post("/sources/{source_id}/breaker/reset", response_model=schemas.SourceBreakerResponse)
+def reset_source_breaker(source_id: int, db: Session = Depends(get_db)):
+    """Close circuit breaker of a source"""
+    db_source = db.query(Source).filter(Source.id == source_id).first()
+    if not db_source:
+        raise HTTPException(status_code=404, detail="Source not found")
+
+    if not circuit_breaker.reset(source_id):
+        raise HTTPException(status_code=503, detail="Circuit breaker storage unavailable")
+    return schemas.SourceBreakerResponse(
+        source_id=db_source.id,
+        name=db_source.name,
+        **circuit_breaker.status(source_id)
+    )
+
+
 @router.post("/sources", response_model=schemas.SourceResponse, status_code=201)
 def create_source(source: schemas.SourceCreate, db: Session = Depends(get_db)):
     """Create new source"""
@@ -25,6 +61,7 @@ def create_source(source: schemas.SourceCreate, db: Session = Depends(get_db)):
     db.add(db_source)
     db.commit()
     db.refresh(db_source)
+    config_cache.invalidate()
     return db_source
 
 
@@ -45,6 +82,7 @@ def update_source(
 
     db.commit()
     db.refresh(db_source)
+    config_cache.invalidate()
     return db_source
 
 
@@ -57,6 +95,7 @@ def delete_source(source_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_source)
     db.commit()
+    config_cache.invalidate()
     return None
 
 
@@ -75,6 +114,7 @@ def create_keyword(keyword: schemas.KeywordCreate, db: Session = Depends(get_db)
     db.add(db_keyword)
     db.commit()
     db.refresh(db_keyword)
+    config_cache.invalidate()
     return db_keyword
 
 
@@ -87,6 +127,7 @@ def delete_keyword(keyword_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_keyword)
     db.commit()
+    config_cache.invalidate()
     return None
 
 
@@ -98,6 +139,26 @@ def get_news(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
     return news
 
 
+@router.get("/news/ranking", response_model=List[schemas.NewsRankingResponse])
+def get_news_ranking(limit: int = 20, db: Session = Depends(get_db)):
+    """Get pending news in generation order with score components"""
+    return [
+        schemas.NewsRankingResponse(
+            news_id=ranked.news_item.id,
+            title=ranked.news_item.title,
+            source=ranked.news_item.source,
+            published_at=ranked.news_item.published_at,
+            score=ranked.score,
+            recency=ranked.recency,
+            keyword_matches=ranked.keyword_matches,
+            coverage=ranked.coverage,
+            source_weight=ranked.source_weight,
+            matched_keywords=ranked.matched_keywords
+        )
+        for ranked in ranking_engine.rank(db, limit=limit)
+    ]
+
+
 @router.get("/news/{news_id}", response_model=schemas.NewsItemResponse)
 def get_news_item(news_id: int, db: Session = Depends(get_db)):
     """Get single news item"""
@@ -153,3 +214,21 @@ def get_stats(db: Session = Depends(get_db)):
         total_sources=total_sources,
         active_sources=active_sources
     )
+
+
+@router.get("/stats/completion-cache", response_model=schemas.CompletionCacheStatsResponse)
+def get_completion_cache_stats():
+    """Get OpenAI completion cache hit/miss counters"""
+    return completion_cache.stats()
+
+
+@router.get("/stats/latency", response_model=schemas.LatencyStatsResponse)
+def get_latency_stats():
+    """Get p50/p95 of time to first token, OpenAI call time and fetch to publish time"""
+    return latency_tracker.stats()
+
+
+@router.get("/stats/models", response_model=Dict[str, schemas.ModelStatsResponse])
+def get_model_stats():
+    """Get per-model requests, fallbacks, latency and post rejection rate"""
+    return model_router.stats()
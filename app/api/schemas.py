@@ -1,6 +1,6 @@
 """Pydantic schemas for API"""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -21,12 +21,26 @@ class NewsItemCreate(NewsItemBase):
 
 class NewsItemResponse(NewsItemBase):
     id: int
+    duplicate_of_id: Optional[int] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class NewsRankingResponse(BaseModel):
+    news_id: int
+    title: str
+    source: str
+    published_at: datetime
+    score: float
+    recency: float
+    keyword_matches: int
+    coverage: int
+    source_weight: float
+    matched_keywords: List[str]
+
+
 # Post schemas
 class PostBase(BaseModel):
     news_id: int
@@ -73,6 +87,15 @@ class SourceResponse(SourceBase):
         from_attributes = True
 
 
+class SourceBreakerResponse(BaseModel):
+    source_id: int
+    name: str
+    state: str
+    failures: int
+    open_until: Optional[datetime] = None
+    cooldown: Optional[float] = None
+
+
 # Keyword schemas
 class KeywordBase(BaseModel):
     word: str = Field(..., max_length=100)
@@ -99,3 +122,32 @@ class StatsResponse(BaseModel):
     failed_posts: int
     total_sources: int
     active_sources: int
+
+
+class CompletionCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: int
+
+
+class LatencyMetricResponse(BaseModel):
+    count: int
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+
+class LatencyStatsResponse(BaseModel):
+    time_to_first_token: LatencyMetricResponse
+    completion: LatencyMetricResponse
+    fetch_to_publish: LatencyMetricResponse
+
+
+class ModelStatsResponse(BaseModel):
+    requests: int
+    errors: int
+    fallbacks: int
+    avg_latency: Optional[float] = None
+    posts: int
+    rejection_rate: float
+    avg_post_chars: Optional[int] = None
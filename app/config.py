@@ -1,4 +1,6 @@
 """Application configuration"""
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,9 +12,29 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_socket_timeout: float = 2.0
 
     # OpenAI
     openai_api_key: str
+    openai_model: str = "gpt-4"  # premium model for long, important or selected-source news
+    openai_timeout: float = 60.0  # seconds per request
+    openai_rpm_limit: int = 500  # requests per minute of the account tier
+    openai_tpm_limit: int = 10000  # tokens per minute of the account tier
+    openai_initial_concurrency: int = 4
+    openai_min_concurrency: int = 1
+    openai_max_concurrency: int = 32
+    openai_max_retries: int = 4
+    openai_throttle_pause: float = 1.0  # seconds, when 429 has no Retry-After
+    openai_call_budget: float = 120.0  # seconds for all attempts of one call
+    openai_backoff_base: float = 1.0  # seconds, doubled per attempt, full jitter
+    openai_backoff_max: float = 30.0
+    openai_hedging_enabled: bool = False  # streams can't be hedged, turns generation_streaming off
+    openai_hedge_min_delay: float = 2.0  # seconds, hedges start after max(p95, this)
+    openai_hedge_max_ratio: float = 0.05  # hedged requests per call
+    openai_hedge_max_tokens: int = 2000  # larger requests are never hedged
+    completion_cache_enabled: bool = True
+    completion_cache_ttl: int = 7 * 24 * 3600  # seconds
+    completion_cache_max_entries: int = 10000
 
     # Telegram
     telegram_bot_token: str
@@ -22,8 +44,88 @@ class Settings(BaseSettings):
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
 
+    # Generation settings
+    generation_batch_size: int = 20  # ranked news generated per run
+    telegram_publish_interval: float = 2.0  # seconds between channel posts
+    generation_streaming: bool = True  # stream completions and hand posts off as soon as they end
+    latency_window: int = 1000  # latency samples kept per metric
+    generation_pack_size: int = 1  # news per OpenAI request, 1 disables packing
+
+    # Prompt settings
+    prompt_title_max_tokens: int = 64
+    prompt_summary_max_tokens: int = 300  # longer summaries are cut on a sentence boundary
+
+    # Model routing settings
+    routing_enabled: bool = True
+    routing_fast_model: str = "gpt-3.5-turbo"  # low-latency model for routine news
+    routing_premium_min_summary_chars: int = 600
+    routing_premium_sources: List[str] = []  # JSON, e.g. ["Habr"]
+    routing_premium_min_score: float = 1.5  # ranking score
+    routing_premium_daily_limit: int = 200  # premium requests per UTC day, then fast model
+
+    # Batch API generation settings
+    batch_enabled: bool = False
+    batch_backend: str = "openai"  # openai or local (offline stand-in)
+    batch_min_age_hours: float = 6.0  # fresher news always use the real-time path
+    batch_max_items: int = 500
+    batch_dir: str = "/tmp/aibot-batches"
+    batch_local_delay: float = 0.0  # seconds before the local stand-in completes a batch
+    batch_publish_per_run: int = 10
+
     # Parsing settings
     parse_interval_minutes: int = 30
+    parse_max_concurrency: int = 10
+    parse_per_host_concurrency: int = 4
+    parse_source_timeout: float = 60.0
+    parse_executor_enabled: bool = True
+    parse_executor_workers: int = 0  # 0 means one process per CPU core
+    parser_backend: str = "lxml"  # lxml or soup
+    parser_definitions_path: str = ""  # defaults to app/news_parser/definitions.json
+
+    # Worker config cache settings
+    config_cache_ttl: float = 300.0  # reload sources and keywords at least this often
+
+    # Seen URL cache settings
+    seen_lru_size: int = 10000  # recent URL hashes kept in each process
+    seen_bloom_capacity: int = 1000000  # URLs the Redis Bloom filter is sized for
+    seen_bloom_error_rate: float = 0.001
+
+    # Near-duplicate detection settings
+    near_duplicate_max_distance: int = 10  # max differing SimHash bits out of 64
+    near_duplicate_window_hours: int = 48
+
+    # Generation ranking settings
+    ranking_candidate_limit: int = 500  # freshest pending news scored per run
+    ranking_half_life_hours: float = 6.0
+    ranking_recency_weight: float = 1.0
+    ranking_keyword_weight: float = 0.5
+    ranking_coverage_weight: float = 0.5
+    ranking_source_weights: Dict[str, float] = {}  # JSON, e.g. {"RBC": 1.0, "Habr": 1.2}
+
+    # HTTP client settings
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 15.0
+    http_max_connections_per_host: int = 10
+    http_max_keepalive_per_host: int = 5
+    http_keepalive_expiry: float = 30.0
+    http_http2: bool = True
+    http_max_response_bytes: int = 2 * 1024 * 1024  # bodies are buffered whole up to this size
+
+    # Per-host politeness settings
+    http_host_rate: float = 2.0  # initial requests per second
+    http_host_min_rate: float = 0.2
+    http_host_max_rate: float = 10.0
+    http_host_rate_step: float = 0.1  # additive increase after success
+    http_host_burst: int = 4
+    http_max_retries: int = 2
+    http_backoff_base: float = 0.5
+    http_backoff_max: float = 10.0
+    http_max_retry_after: float = 30.0  # give up on hosts asking to wait longer
+
+    # Source circuit breaker settings
+    breaker_failure_threshold: int = 3
+    breaker_cooldown: float = 300.0  # seconds before the first probe
+    breaker_max_cooldown: float = 3600.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
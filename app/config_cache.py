@@ -0,0 +1,143 @@
+"""Worker-side cache of sources and keywords"""
+import logging
+import threading
+import time
+from typing import List, Optional
+
+import redis
+
+from app.config import settings
+from app.keyword_matcher import KeywordMatcher, get_matcher
+from app.models import Keyword, SessionLocal, Source
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigCache:
+    """Keeps enabled sources, keywords and the compiled keyword matcher in memory
+
+    The API calls `invalidate()` after every change, which bumps a version
+    counter in Redis and publishes it. Workers listen on the channel in a
+    background thread and reload on the next read. If the listener is not
+    running the version counter is compared on every read instead, and
+    without Redis the cache is reloaded every time. Entries older than
+    `config_cache_ttl` are reloaded anyway to pick up direct database edits.
+    """
+
+    version_key = "aibot:config:version"
+    channel = "aibot:config"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources: List[Source] = []
+        self._keywords: List[str] = []
+        self._matcher: Optional[KeywordMatcher] = None
+        self._version: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        self._listener = None
+
+    def invalidate(self):
+        """Tell all workers that sources or keywords changed"""
+        self._stale = True
+        try:
+            r = get_redis()
+            version = r.incr(self.version_key)
+            r.publish(self.channel, version)
+        except redis.RedisError as e:
+            logger.error(f"Failed to publish config invalidation: {e}")
+
+    def _on_message(self, message):
+        self._stale = True
+        logger.info(f"Config changed, version {message['data']}")
+
+    def _on_listener_error(self, error, pubsub, thread):
+        logger.warning(f"Config invalidation listener stopped: {error}")
+        self._stale = True
+        self._listener = None
+        thread.stop()
+        pubsub.close()
+
+    def _ensure_listener(self) -> bool:
+        """Start the invalidation listener thread if it's not running"""
+        if self._listener is not None and self._listener.is_alive():
+            return True
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_listener_error
+            )
+            # Changes made before subscribing are caught by the version check
+            self._stale = True
+            return True
+        except redis.RedisError as e:
+            logger.warning(f"Config invalidation listener unavailable: {e}")
+            return False
+
+    def _fetch_version(self) -> Optional[str]:
+        try:
+            return get_redis().get(self.version_key) or "0"
+        except redis.RedisError:
+            return None
+
+    def _refresh(self):
+        """Reload configuration from the database if it may have changed"""
+        listening = self._ensure_listener()
+        expired = (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > settings.config_cache_ttl
+        )
+        if listening and not self._stale and not expired:
+            return
+
+        version = self._fetch_version()
+        if not self._stale and not expired and version is not None and version == self._version:
+            return
+
+        with self._lock:
+            # Changes published while loading mark the cache stale again
+            self._stale = False
+            db = SessionLocal()
+            try:
+                sources = db.query(Source).filter(Source.enabled == True).order_by(Source.id).all()
+                keywords = [kw.word for kw in db.query(Keyword).order_by(Keyword.id).all()]
+                # Sources outlive the session, only their columns are used
+                db.expunge_all()
+            except Exception:
+                self._stale = True
+                raise
+            finally:
+                db.close()
+
+            self._sources = sources
+            self._keywords = keywords
+            self._matcher = get_matcher(keywords) if keywords else None
+            self._version = version
+            self._loaded_at = time.monotonic()
+            logger.info(
+                f"Loaded config version {version}: "
+                f"{len(sources)} sources, {len(keywords)} keywords"
+            )
+
+    def enabled_sources(self) -> List[Source]:
+        """Get enabled sources"""
+        self._refresh()
+        return list(self._sources)
+
+    def keywords(self) -> List[str]:
+        """Get all keyword words"""
+        self._refresh()
+        return list(self._keywords)
+
+    def keyword_matcher(self) -> Optional[KeywordMatcher]:
+        """Get matcher compiled for current keywords, None if there are none"""
+        self._refresh()
+        return self._matcher
+
+
+# Global config cache instance
+config_cache = ConfigCache()
@@ -0,0 +1,84 @@
+"""Ingest pipeline for parsed news items
+
+Items flow through generator stages: dedupe → filter → rows → persist.
+Only items that survive dedupe and keyword filtering are turned into
+insert rows, and they are written with one Core statement per page.
+"""
+import logging
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.keyword_matcher import KeywordMatcher
+from app.models import NewsItem
+from app.near_duplicates import near_duplicates, news_fingerprint
+from app.news_parser.items import ParsedItem
+from app.seen_cache import seen_urls
+
+logger = logging.getLogger(__name__)
+
+
+def dedupe(items: Iterable[ParsedItem]) -> Iterator[ParsedItem]:
+    """Drop items with URLs stored on previous runs"""
+    # One batched cache lookup per page
+    items = list(items)
+    is_new = seen_urls.filter_new([item.url_hash for item in items])
+    for item, new in zip(items, is_new):
+        if new:
+            yield item
+
+
+def filter_by_keywords(
+    items: Iterable[ParsedItem],
+    matcher: Optional[KeywordMatcher]
+) -> Iterator[ParsedItem]:
+    """Keep items mentioning any keyword, all items if there are no keywords"""
+    for item in items:
+        if matcher is not None:
+            matched = matcher.match(item.text)
+            if not matched:
+                logger.debug(f"Filtered out by keywords: {item.title[:50]}...")
+                continue
+            logger.debug(f"Matched keywords {matched}: {item.title[:50]}...")
+        yield item
+
+
+def build_rows(items: Iterable[ParsedItem]) -> Iterator[dict]:
+    """Build insert rows, linking rewrites of recent news to the original item"""
+    for item in items:
+        row = item.to_row()
+        row['simhash'] = news_fingerprint(item.title, item.summary)
+        row['duplicate_of_id'] = near_duplicates.find(row['simhash'])
+        yield row
+
+
+def save_news_items(rows: list[dict], db) -> dict[int, int]:
+    """Insert news rows in one statement, skipping URLs that already exist
+
+    Returns ids of inserted rows keyed by url_hash.
+    """
+    if not rows:
+        return {}
+
+    # Deduplicate by canonical URL hash, ON CONFLICT also covers concurrent workers
+    stmt = insert(NewsItem).values(rows).on_conflict_do_nothing(
+        index_elements=[NewsItem.url_hash]
+    ).returning(NewsItem.url_hash, NewsItem.id)
+    return dict(db.execute(stmt).all())
+
+
+def remember_saved(rows: list[dict], inserted: dict[int, int]) -> int:
+    """Update dedupe indexes after commit, returns number of near-duplicates saved"""
+    # Inserted and conflicting URLs are all stored now
+    seen_urls.add(row['url_hash'] for row in rows)
+
+    near_duplicate_count = 0
+    for row in rows:
+        news_id = inserted.get(row['url_hash'])
+        if news_id is None:
+            continue
+        if row['duplicate_of_id'] is None:
+            near_duplicates.add(news_id, row['simhash'])
+        else:
+            near_duplicate_count += 1
+    return near_duplicate_count
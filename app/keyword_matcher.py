@@ -0,0 +1,92 @@
+"""Keyword matching over stemmed words"""
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+import snowballstemmer
+
+WORD_RE = re.compile(r"\w+")
+
+_stemmers = {
+    'russian': snowballstemmer.stemmer('russian'),
+    'english': snowballstemmer.stemmer('english'),
+}
+
+
+@lru_cache(maxsize=100000)
+def stem(word: str) -> str:
+    """Stem a lowercase word with the Russian or English stemmer"""
+    language = 'english' if word.isascii() else 'russian'
+    return _stemmers[language].stemWord(word)
+
+
+def stem_words(text: str) -> List[str]:
+    """Split text into stemmed lowercase words"""
+    return [stem(word) for word in WORD_RE.findall(text.lower().replace('ё', 'е'))]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over stemmed words of keyword phrases
+
+    Both keywords and text are reduced to word stems, so "технологии"
+    matches "технология", and a multi-word keyword matches the same words
+    in a row. One pass over the text finds all keywords.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            stems = stem_words(keyword)
+            if not stems:
+                continue
+            node = 0
+            for word in stems:
+                next_node = self._goto[node].get(word)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][word] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(index)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def match(self, text: str) -> List[str]:
+        """Get keywords found in text, in keyword order"""
+        found = set()
+        node = 0
+        for word in stem_words(text):
+            while node and word not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(word, 0)
+            found.update(self._output[node])
+        return [self.keywords[index] for index in sorted(found)]
+
+
+@lru_cache(maxsize=8)
+def _compile(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """Get matcher compiled for this keyword set, rebuilt only when it changes"""
+    return _compile(tuple(sorted(set(keywords))))
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -28,15 +29,21 @@ class NewsItem(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
-    url = Column(String(1000), nullable=False, unique=True, index=True)
+    url = Column(String(1000), nullable=False)
+    url_hash = Column(BigInteger, nullable=False, unique=True, index=True)  # see utils.url_hash
     summary = Column(Text)
     source = Column(String(100), nullable=False, index=True)
     published_at = Column(DateTime, nullable=False, index=True)
     raw_text = Column(Text)
+    simhash = Column(BigInteger)  # see near_duplicates.simhash
+    duplicate_of_id = Column(Integer, ForeignKey("news_items.id"), index=True)
+    generation_batch_id = Column(Integer, ForeignKey("generation_batches.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     posts = relationship("Post", back_populates="news_item")
+    duplicate_of = relationship("NewsItem", remote_side=[id])
+    generation_batch = relationship("GenerationBatch", back_populates="news_items")
 
     def __repr__(self):
         return f"<NewsItem(id={self.id}, title='{self.title[:50]}...')>"
@@ -50,7 +57,7 @@ class Post(Base):
     news_id = Column(Integer, ForeignKey("news_items.id"), nullable=False)
     generated_text = Column(Text, nullable=False)
     published_at = Column(DateTime, index=True)
-    status = Column(String(50), default="pending", index=True)  # pending, published, failed
+    status = Column(String(50), default="pending", index=True)  # pending, published, failed, draft
     error_message = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -61,6 +68,30 @@ class Post(Base):
         return f"<Post(id={self.id}, status='{self.status}')>"
 
 
+class GenerationBatch(Base):
+    """Batch API job generating posts for non-urgent news"""
+    __tablename__ = "generation_batches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    backend = Column(String(20), nullable=False)  # openai, local
+    provider_batch_id = Column(String(100), nullable=False, index=True)
+    input_file_id = Column(String(200))
+    output_file_id = Column(String(200))
+    # validating, in_progress, finalizing, completed, failed, expired, cancelling, cancelled
+    status = Column(String(50), default="validating", index=True)
+    request_count = Column(Integer, default=0)
+    completed_count = Column(Integer, default=0)
+    error_message = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)
+
+    # Relationships
+    news_items = relationship("NewsItem", back_populates="generation_batch")
+
+    def __repr__(self):
+        return f"<GenerationBatch(id={self.id}, status='{self.status}')>"
+
+
 class Source(Base):
     """News source model"""
     __tablename__ = "sources"
@@ -72,10 +103,36 @@ class Source(Base):
     enabled = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Relationships
+    fetch_state = relationship(
+        "SourceFetchState",
+        back_populates="source",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
+
     def __repr__(self):
         return f"<Source(id={self.id}, name='{self.name}')>"
 
 
+class SourceFetchState(Base):
+    """HTTP validators and content hash of the last fetched listing page"""
+    __tablename__ = "source_fetch_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_id = Column(Integer, ForeignKey("sources.id"), nullable=False, unique=True)
+    etag = Column(String(500))
+    last_modified = Column(String(100))
+    content_hash = Column(String(64))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    source = relationship("Source", back_populates="fetch_state")
+
+    def __repr__(self):
+        return f"<SourceFetchState(source_id={self.source_id}, etag='{self.etag}')>"
+
+
 class Keyword(Base):
     """Keyword for filtering model"""
     __tablename__ = "keywords"
@@ -0,0 +1,113 @@
+"""Near-duplicate news detection with SimHash"""
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models import NewsItem
+from app.utils import hash64, to_int64
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase words without punctuation and short stop-like words, numbers are kept"""
+    return [
+        token for token in TOKEN_RE.findall(text.lower().replace('ё', 'е'))
+        if len(token) > 2 or token.isdigit()
+    ]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of words and word pairs, signed to fit BIGINT"""
+    tokens = normalize_tokens(text)
+    features = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        value = hash64(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return to_int64(sum(1 << bit for bit, weight in enumerate(weights) if weight > 0))
+
+
+def news_fingerprint(title: str, summary: Optional[str]) -> int:
+    """SimHash of title and summary, a title repeated in the summary counts once"""
+    summary = (summary or '').replace(title, ' ')
+    return simhash(f"{title} {summary}")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << FINGERPRINT_BITS) - 1)).count('1')
+
+
+class NearDuplicateIndex:
+    """SimHash index of recent original news
+
+    Fingerprints are split into `max_distance + 1` bands. Two fingerprints
+    differing in at most `max_distance` bits agree on at least one whole
+    band, so only items sharing a band bucket are compared. The index is
+    rebuilt from the `simhash` column for the configured time window at
+    the start of every parse run.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, int]]] = defaultdict(list)
+        self._bands: List[Tuple[int, int]] = []
+
+    def _layout(self) -> List[Tuple[int, int]]:
+        """(shift, mask) of each band"""
+        count = min(settings.near_duplicate_max_distance + 1, FINGERPRINT_BITS)
+        bands, shift = [], 0
+        for i in range(count):
+            width = FINGERPRINT_BITS // count + (1 if i < FINGERPRINT_BITS % count else 0)
+            bands.append((shift, (1 << width) - 1))
+            shift += width
+        return bands
+
+    def _keys(self, fingerprint: int):
+        for band, (shift, mask) in enumerate(self._bands):
+            yield band, fingerprint >> shift & mask
+
+    def load(self, db):
+        """Rebuild the index from original news within the time window"""
+        self._buckets.clear()
+        self._bands = self._layout()
+
+        since = datetime.utcnow() - timedelta(hours=settings.near_duplicate_window_hours)
+        rows = db.query(NewsItem.id, NewsItem.simhash).filter(
+            NewsItem.published_at >= since,
+            NewsItem.simhash.isnot(None),
+            NewsItem.duplicate_of_id.is_(None)
+        ).all()
+
+        for news_id, fingerprint in rows:
+            self.add(news_id, fingerprint)
+        logger.info(f"Loaded {len(rows)} news into near-duplicate index")
+
+    def add(self, news_id: int, fingerprint: int):
+        """Index an original news item"""
+        if not self._bands:
+            self._bands = self._layout()
+        for key in self._keys(fingerprint):
+            self._buckets[key].append((news_id, fingerprint))
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Get id of the closest original news within the threshold"""
+        best = None
+        for key in self._keys(fingerprint):
+            for news_id, other in self._buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, other)
+                if distance <= settings.near_duplicate_max_distance and (best is None or distance < best[0]):
+                    best = (distance, news_id)
+        return best[1] if best else None
+
+
+# Global near-duplicate index instance
+near_duplicates = NearDuplicateIndex()
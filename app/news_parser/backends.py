@@ -0,0 +1,190 @@
+"""HTML extraction backends for listing pages"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.news_parser.streaming import ContainerMatcher, iter_listing_elements
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('title', 'link', 'summary', 'date')
+
+
+@dataclass(frozen=True)
+class SelectorSpec:
+    """Declarative description of a listing page
+
+    `listing` holds container selectors in order of preference, each one
+    either `tag` or `tag.class`. Field rules are tried in order until one
+    gives a non-empty value. A rule is a CSS selector relative to the
+    container, optionally followed by `@attribute`; without the attribute
+    the element text is used, and a bare `@attribute` reads the container
+    itself.
+    """
+    listing: Tuple[str, ...]
+    title: Tuple[str, ...]
+    link: Tuple[str, ...]
+    summary: Tuple[str, ...] = ()
+    date: Tuple[str, ...] = ()
+
+
+def split_rule(rule: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split `selector@attr` rule into selector and attribute"""
+    selector, sep, attr = rule.rpartition('@')
+    if not sep or not attr.replace('-', '').replace('_', '').isalnum():
+        return rule.strip() or None, None
+    return selector.strip() or None, attr
+
+
+def container_matcher(selector: str) -> ContainerMatcher:
+    """Build streaming matcher from `tag` or `tag.class` selector"""
+    tag, _, css_class = selector.partition('.')
+    return ContainerMatcher(tag, css_class or None)
+
+
+class ParserBackend:
+    """Base extraction backend, returns raw field strings per container"""
+
+    name: str = ""
+
+    def extract(
+        self,
+        content: bytes,
+        spec: SelectorSpec,
+        limit: int,
+        encoding: Optional[str] = None
+    ) -> List[Dict[str, Optional[str]]]:
+        raise NotImplementedError
+
+
+class LxmlBackend(ParserBackend):
+    """Streaming lxml backend with selectors compiled to XPath once"""
+
+    name = "lxml"
+
+    def __init__(self):
+        self._compiled: Dict[SelectorSpec, tuple] = {}
+
+    def _compile(self, spec: SelectorSpec) -> tuple:
+        """Compile spec selectors, cached per spec"""
+        compiled = self._compiled.get(spec)
+        if compiled is None:
+            from lxml.cssselect import CSSSelector
+
+            matchers = [container_matcher(selector) for selector in spec.listing]
+            fields = {}
+            for field in FIELDS:
+                rules = []
+                for rule in getattr(spec, field):
+                    selector, attr = split_rule(rule)
+                    rules.append((CSSSelector(selector) if selector else None, attr))
+                fields[field] = rules
+            compiled = (matchers, fields)
+            self._compiled[spec] = compiled
+        return compiled
+
+    @staticmethod
+    def _text(element) -> str:
+        return " ".join(part.strip() for part in element.itertext() if part.strip())
+
+    def _value(self, container, rules) -> Optional[str]:
+        for selector, attr in rules:
+            elements = [container] if selector is None else selector(container)
+            for element in elements:
+                value = element.get(attr) if attr else self._text(element)
+                if value:
+                    return value
+        return None
+
+    def extract(self, content, spec, limit, encoding=None):
+        matchers, fields = self._compile(spec)
+        results = []
+        for container in iter_listing_elements(content, matchers, limit, encoding):
+            results.append({
+                field: self._value(container, rules) for field, rules in fields.items()
+            })
+        return results
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup fallback backend"""
+
+    name = "soup"
+
+    def _containers(self, content: bytes, spec: SelectorSpec, encoding: Optional[str]) -> Iterator:
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        matchers = [container_matcher(selector) for selector in spec.listing]
+
+        def is_container(name, attrs) -> bool:
+            classes = attrs.get('class') or []
+            if isinstance(classes, str):
+                classes = classes.split()
+            return any(
+                name == matcher.tag and (matcher.css_class is None or matcher.css_class in classes)
+                for matcher in matchers
+            )
+
+        # Only build the DOM for container candidates
+        strainer = SoupStrainer(is_container)
+        soup = BeautifulSoup(content, 'lxml', parse_only=strainer, from_encoding=encoding)
+
+        for selector in spec.listing:
+            containers = soup.select(selector)
+            if containers:
+                return iter(containers)
+        return iter(())
+
+    @staticmethod
+    def _value(container, rules) -> Optional[str]:
+        for rule in rules:
+            selector, attr = split_rule(rule)
+            elements = [container] if selector is None else container.select(selector)
+            for element in elements:
+                value = element.get(attr) if attr else element.get_text(" ", strip=True)
+                if value:
+                    return value
+        return None
+
+    def extract(self, content, spec, limit, encoding=None):
+        results = []
+        for container in self._containers(content, spec, encoding):
+            if len(results) >= limit:
+                break
+            results.append({
+                field: self._value(container, getattr(spec, field)) for field in FIELDS
+            })
+        return results
+
+
+BACKENDS: Dict[str, ParserBackend] = {}
+
+
+def clear_compiled():
+    """Drop compiled selectors, e.g. after parser definitions change"""
+    for backend in BACKENDS.values():
+        if isinstance(backend, LxmlBackend):
+            backend._compiled.clear()
+
+
+def get_backend(name: str) -> ParserBackend:
+    """Get extraction backend by name, falling back to BeautifulSoup"""
+    backend = BACKENDS.get(name)
+    if backend is not None:
+        return backend
+
+    if name == LxmlBackend.name:
+        try:
+            import lxml.cssselect  # noqa: F401
+            backend = LxmlBackend()
+        except ImportError:
+            logger.warning("cssselect is not installed, using BeautifulSoup parser backend")
+            backend = get_backend(SoupBackend.name)
+    elif name == SoupBackend.name:
+        backend = SoupBackend()
+    else:
+        logger.error(f"Unknown parser backend: {name}, using BeautifulSoup")
+        backend = get_backend(SoupBackend.name)
+
+    BACKENDS[name] = backend
+    return backend
@@ -0,0 +1,137 @@
+"""Per-source circuit breaker shared by all workers through Redis"""
+import logging
+import time
+
+import redis
+
+from app.config import settings
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# Reported when the state can't be read
+UNKNOWN = "unknown"
+
+
+class CircuitBreaker:
+    """Circuit breaker with closed/open/half-open states per source
+
+    After `breaker_failure_threshold` consecutive failures the source is
+    opened and skipped for a cooldown. When the cooldown expires a single
+    worker is let through as a probe: success closes the breaker, failure
+    opens it again with a doubled cooldown.
+    """
+
+    key_prefix = "aibot:breaker"
+
+    def _key(self, source_id: int) -> str:
+        return f"{self.key_prefix}:{source_id}"
+
+    def _probe_key(self, source_id: int) -> str:
+        return f"{self.key_prefix}:{source_id}:probe"
+
+    def allow(self, source_id: int) -> bool:
+        """Check if the source may be fetched now"""
+        try:
+            r = get_redis()
+            data = r.hgetall(self._key(source_id))
+            state = data.get("state", CLOSED)
+
+            if state == CLOSED:
+                return True
+
+            if state == OPEN and time.time() < float(data.get("open_until", 0)):
+                return False
+
+            # Cooldown is over: only one worker at a time gets to probe
+            probe_acquired = r.set(
+                self._probe_key(source_id), 1,
+                nx=True, ex=int(settings.parse_source_timeout) + 1
+            )
+            if not probe_acquired:
+                return False
+
+            r.hset(self._key(source_id), "state", HALF_OPEN)
+            logger.info(f"Circuit breaker for source {source_id} is half-open, probing")
+            return True
+
+        except redis.RedisError as e:
+            # Never block parsing because Redis is unavailable
+            logger.warning(f"Circuit breaker unavailable, allowing source {source_id}: {e}")
+            return True
+
+    def record_success(self, source_id: int):
+        """Close the breaker after a successful fetch"""
+        try:
+            r = get_redis()
+            if r.hget(self._key(source_id), "state") not in (None, CLOSED):
+                logger.info(f"Circuit breaker for source {source_id} closed")
+            r.delete(self._key(source_id), self._probe_key(source_id))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to update circuit breaker for source {source_id}: {e}")
+
+    def record_failure(self, source_id: int):
+        """Count a failure and open the breaker when the threshold is reached"""
+        try:
+            r = get_redis()
+            key = self._key(source_id)
+            data = r.hgetall(key)
+            state = data.get("state", CLOSED)
+
+            if state == HALF_OPEN:
+                # Probe failed, stay open twice as long
+                cooldown = min(
+                    float(data.get("cooldown", settings.breaker_cooldown)) * 2,
+                    settings.breaker_max_cooldown
+                )
+                self._open(r, source_id, cooldown)
+                return
+
+            failures = r.hincrby(key, "failures", 1)
+            if failures >= settings.breaker_failure_threshold:
+                self._open(r, source_id, settings.breaker_cooldown)
+
+        except redis.RedisError as e:
+            logger.warning(f"Failed to update circuit breaker for source {source_id}: {e}")
+
+    def _open(self, r: redis.Redis, source_id: int, cooldown: float):
+        """Move breaker to the open state for the given cooldown"""
+        now = time.time()
+        r.hset(self._key(source_id), mapping={
+            "state": OPEN,
+            "opened_at": now,
+            "open_until": now + cooldown,
+            "cooldown": cooldown,
+        })
+        r.delete(self._probe_key(source_id))
+        logger.warning(f"Circuit breaker for source {source_id} opened for {cooldown:.0f}s")
+
+    def status(self, source_id: int) -> dict:
+        """Current breaker state of the source, `unknown` without Redis"""
+        try:
+            data = get_redis().hgetall(self._key(source_id))
+        except redis.RedisError as e:
+            logger.warning(f"Circuit breaker state unavailable for source {source_id}: {e}")
+            return {"state": UNKNOWN, "failures": 0, "open_until": None, "cooldown": None}
+        return {
+            "state": data.get("state", CLOSED),
+            "failures": int(data.get("failures", 0)),
+            "open_until": float(data["open_until"]) if "open_until" in data else None,
+            "cooldown": float(data["cooldown"]) if "cooldown" in data else None,
+        }
+
+    def reset(self, source_id: int) -> bool:
+        """Force the breaker back to the closed state, False if Redis is unavailable"""
+        try:
+            get_redis().delete(self._key(source_id), self._probe_key(source_id))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to reset circuit breaker for source {source_id}: {e}")
+            return False
+        return True
+
+
+# Global circuit breaker instance
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,90 @@
+"""Process pool for CPU-bound listing page extraction"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from app.config import settings
+from app.news_parser.items import ParsedItem
+
+logger = logging.getLogger(__name__)
+
+# Give up on the pool after this many crashes and parse inline
+MAX_POOL_CRASHES = 3
+
+
+def _extract(parser_name: str, content: bytes, url: str, encoding: Optional[str]) -> List[ParsedItem]:
+    """Run parser extraction inside a pool process"""
+    from app.news_parser.registry import parser_registry
+
+    parser = parser_registry.get_parser(parser_name)
+    return parser.extract(content, url, encoding)
+
+
+class ParseExecutor:
+    """Offloads HTML extraction from the event loop to a process pool
+
+    Parsers hand over raw page bytes and get ParsedItem records back, so
+    fetching on the loop overlaps with parsing on all cores. If the pool
+    can't be used (disabled, or the worker is not allowed to spawn
+    processes) extraction runs inline as before.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._disabled = not settings.parse_executor_enabled
+        self._crashes = 0
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Create the pool on first use"""
+        if self._disabled:
+            return None
+
+        if self._pool is None:
+            workers = settings.parse_executor_workers or os.cpu_count() or 1
+            # spawn avoids forking a worker that already runs threads and sockets
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Started parse executor with {workers} processes")
+        return self._pool
+
+    async def extract(self, parser, content: bytes, url: str, encoding: Optional[str] = None) -> List[ParsedItem]:
+        """Extract news items from page bytes in a pool process"""
+        # Pool processes rebuild the parser from its definition name
+        pool = self._get_pool() if parser.name else None
+        if pool is None:
+            return parser.extract(content, url, encoding)
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            return await loop.run_in_executor(pool, _extract, parser.name, content, url, encoding)
+        except BrokenProcessPool as e:
+            logger.error(f"Parse executor crashed: {e}")
+            self.shutdown()
+            self._crashes += 1
+            if self._crashes >= MAX_POOL_CRASHES:
+                logger.warning("Parse executor keeps crashing, parsing inline from now on")
+                self._disabled = True
+        except (AssertionError, OSError) as e:
+            # e.g. daemonic processes are not allowed to have children
+            logger.warning(f"Parse executor unavailable, parsing inline: {e}")
+            self.shutdown()
+            self._disabled = True
+
+        return parser.extract(content, url, encoding)
+
+    def shutdown(self):
+        """Stop pool processes"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global executor instance
+parse_executor = ParseExecutor()
@@ -0,0 +1,79 @@
+"""Shared HTTP client manager for news parsers"""
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_supported() -> bool:
+    """Check if the optional h2 package is installed"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPClientManager:
+    """Process-wide pool of keep-alive HTTP clients, one per host"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http2 = settings.http_http2 and _http2_supported()
+
+        if settings.http_http2 and not self._http2:
+            logger.warning("HTTP/2 requested but h2 package is not installed, using HTTP/1.1")
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create client with configured timeouts and pool limits"""
+        timeout = httpx.Timeout(
+            settings.http_read_timeout,
+            connect=settings.http_connect_timeout
+        )
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections_per_host,
+            max_keepalive_connections=settings.http_max_keepalive_per_host,
+            keepalive_expiry=settings.http_keepalive_expiry
+        )
+        # httpx negotiates gzip/deflate, and brotli when the brotli package is installed
+        return httpx.AsyncClient(
+            http2=self._http2,
+            timeout=timeout,
+            limits=limits,
+            follow_redirects=True
+        )
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Get keep-alive client for the host of the given URL"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Pooled connections are bound to the loop that opened them
+            self._clients = {}
+            self._loop = loop
+
+        host = urlsplit(url).netloc.lower()
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._create_client()
+            self._clients[host] = client
+        return client
+
+    async def aclose(self):
+        """Close all pooled clients"""
+        clients, self._clients = self._clients, {}
+        for host, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client for {host}: {e}")
+
+
+# Global client manager instance
+http_clients = HTTPClientManager()
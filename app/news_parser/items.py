@@ -0,0 +1,39 @@
+"""Parsed news item record"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedItem:
+    """News item extracted from a listing page
+
+    Items are sent back from pool processes and most of them are dropped
+    by deduplication, so they are kept slotted and immutable instead of
+    dicts or ORM objects. `url_hash` is the canonical URL hash computed
+    while the item is built.
+    """
+    title: str
+    url: str
+    url_hash: int
+    source: str
+    published_at: datetime
+    summary: Optional[str] = None
+    raw_text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Title and summary used for matching"""
+        return f"{self.title} {self.summary or ''}"
+
+    def to_row(self) -> dict:
+        """Column values for inserting into news_items"""
+        return {
+            'title': self.title,
+            'url': self.url,
+            'url_hash': self.url_hash,
+            'summary': self.summary,
+            'source': self.source,
+            'published_at': self.published_at,
+            'raw_text': self.raw_text,
+        }
@@ -0,0 +1,129 @@
+"""Per-host politeness scheduler with token-bucket rate limiting"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HostBlockedError(Exception):
+    """Host asked us to wait longer than we are willing to"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostThrottle:
+    """Adaptive token bucket for a single host
+
+    The rate grows additively after successful requests and shrinks
+    multiplicatively when the host throttles us or fails.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.rate = settings.http_host_rate
+        self.capacity = float(settings.http_host_burst)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.errors = 0
+
+    def _refill(self, now: float):
+        """Add tokens accumulated since last update"""
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait for the host block to expire and for a free token"""
+        now = time.monotonic()
+        blocked_for = self.blocked_until - now
+        if blocked_for > settings.http_max_retry_after:
+            raise HostBlockedError(f"{self.host} is blocked for {blocked_for:.0f}s")
+
+        self._refill(now)
+        # Reserve the token right away, concurrent callers queue behind it
+        self.tokens -= 1
+        wait = max(blocked_for, -self.tokens / self.rate if self.tokens < 0 else 0.0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """Probe for a higher rate after a successful request"""
+        self.errors = 0
+        self.rate = min(settings.http_host_max_rate, self.rate + settings.http_host_rate_step)
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """Slow down after 429/503 or a failed request"""
+        self.errors += 1
+        self.rate = max(settings.http_host_min_rate, self.rate / 2)
+
+        delay = retry_after if retry_after is not None else self.backoff_delay()
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        logger.warning(f"Throttling {self.host}: rate {self.rate:.2f} req/s, paused for {delay:.1f}s")
+
+    def backoff_delay(self) -> float:
+        """Exponential backoff with full jitter based on consecutive errors"""
+        ceiling = min(
+            settings.http_backoff_max,
+            settings.http_backoff_base * (2 ** max(0, self.errors - 1))
+        )
+        return random.uniform(0, ceiling)
+
+    def stats(self) -> dict:
+        """Current state of the host throttle"""
+        return {
+            "rate": round(self.rate, 3),
+            "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+            "errors": self.errors,
+        }
+
+
+class PolitenessScheduler:
+    """Process-wide registry of per-host throttles"""
+
+    def __init__(self):
+        self._hosts: Dict[str, HostThrottle] = {}
+
+    def for_url(self, url: str) -> HostThrottle:
+        """Get throttle for the host of the given URL"""
+        host = urlsplit(url).netloc.lower()
+        throttle = self._hosts.get(host)
+        if throttle is None:
+            throttle = HostThrottle(host)
+            self._hosts[host] = throttle
+        return throttle
+
+    def stats(self) -> dict[str, dict]:
+        """Current request rate and backoff state per host"""
+        return {host: throttle.stats() for host, throttle in self._hosts.items()}
+
+
+# Global scheduler instance
+host_scheduler = PolitenessScheduler()
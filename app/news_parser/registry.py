@@ -0,0 +1,133 @@
+"""Registry of declarative parser definitions"""
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.news_parser.backends import SelectorSpec, clear_compiled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEFINITIONS_PATH = os.path.join(os.path.dirname(__file__), "definitions.json")
+DEFAULT_PARSER_CLASS = "app.news_parser.sites.NewsParser"
+
+
+@dataclass(frozen=True)
+class ParserDefinition:
+    """Site description loaded from the definitions file"""
+    name: str
+    base_url: str
+    source_name: str
+    spec: SelectorSpec
+    default_url: Optional[str] = None
+    item_limit: int = 20
+    backend: Optional[str] = None
+    parser_class: str = DEFAULT_PARSER_CLASS
+    # (compiled URL pattern, name template) pairs, groups are title-cased
+    source_names: Tuple[Tuple[re.Pattern, str], ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ParserDefinition":
+        spec = SelectorSpec(
+            listing=tuple(data["listing"]),
+            title=tuple(data["title"]),
+            link=tuple(data["link"]),
+            summary=tuple(data.get("summary", ())),
+            date=tuple(data.get("date", ())),
+        )
+        return cls(
+            name=data["name"].lower(),
+            base_url=data["base_url"],
+            source_name=data.get("source_name", data["name"]),
+            spec=spec,
+            default_url=data.get("default_url"),
+            item_limit=data.get("item_limit", 20),
+            backend=data.get("backend"),
+            parser_class=data.get("parser_class", DEFAULT_PARSER_CLASS),
+            source_names=tuple(
+                (re.compile(rule["pattern"]), rule["name"])
+                for rule in data.get("source_names", ())
+            ),
+        )
+
+    def matches(self, source_type: str) -> bool:
+        """Match source names like `rbc` or `rbc_politics`"""
+        return source_type == self.name or source_type.startswith(f"{self.name}_")
+
+
+class ParserRegistry:
+    """Loads parser definitions once and caches parser instances
+
+    The definitions file is re-read only when its modification time
+    changes, so editing it takes effect without a restart.
+    """
+
+    def __init__(self):
+        self._definitions: Dict[str, ParserDefinition] = {}
+        self._parsers: Dict[str, object] = {}
+        self._mtime: Optional[float] = None
+
+    @property
+    def path(self) -> str:
+        return settings.parser_definitions_path or DEFAULT_DEFINITIONS_PATH
+
+    def _refresh(self):
+        """Reload definitions if the file changed"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            logger.error(f"Parser definitions not found at {self.path}: {e}")
+            return
+
+        if mtime == self._mtime:
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            definitions = {}
+            for item in data["parsers"]:
+                definition = ParserDefinition.from_dict(item)
+                definitions[definition.name] = definition
+        except (OSError, ValueError, KeyError, re.error) as e:
+            # Keep serving the previous definitions
+            logger.error(f"Failed to load parser definitions from {self.path}: {e}")
+            return
+
+        self._definitions = definitions
+        self._parsers = {}
+        self._mtime = mtime
+        clear_compiled()
+        logger.info(f"Loaded {len(definitions)} parser definitions")
+
+    def get_definition(self, name: str) -> Optional[ParserDefinition]:
+        """Get definition by exact name"""
+        self._refresh()
+        return self._definitions.get(name.lower())
+
+    def get_parser(self, source_type: str):
+        """Get cached parser instance for a source type"""
+        self._refresh()
+        source_type = source_type.lower()
+
+        for definition in self._definitions.values():
+            if not definition.matches(source_type):
+                continue
+
+            parser = self._parsers.get(definition.name)
+            if parser is None:
+                module_name, class_name = definition.parser_class.rsplit(".", 1)
+                parser_class = getattr(import_module(module_name), class_name)
+                parser = parser_class(definition)
+                self._parsers[definition.name] = parser
+            return parser
+
+        return None
+
+
+# Global registry instance
+parser_registry = ParserRegistry()
@@ -1,60 +1,248 @@
 """Web site parsers for news sources - base classes and factory"""
+import hashlib
 import logging
+from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Optional
+from urllib.parse import urljoin
 
 import httpx
 
+from app.config import settings
+from app.news_parser.backends import get_backend
+from app.news_parser.executor import parse_executor
+from app.news_parser.http_client import http_clients
+from app.news_parser.items import ParsedItem
+from app.news_parser.politeness import host_scheduler, parse_retry_after
+from app.news_parser.registry import ParserDefinition, parser_registry
+from app.utils import clean_text, parse_date, url_hash
+
 logger = logging.getLogger(__name__)
 
+# Statuses worth retrying after a pause
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+
+
+@dataclass
+class FetchResult:
+    """Result of a conditional listing page fetch"""
+    content: Optional[bytes]
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    not_modified: bool = False
+
 
 class NewsParser:
-    """Base news parser class"""
+    """Base news parser configured by a parser definition"""
+
+    # Definition used when the parser is created directly, e.g. RBCParser()
+    definition_name: Optional[str] = None
 
-    def __init__(self):
+    def __init__(self, definition: Optional[ParserDefinition] = None):
+        if definition is None and self.definition_name:
+            definition = parser_registry.get_definition(self.definition_name)
+
+        self.definition = definition
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
+        self.name = definition.name if definition else None
+        self.base_url = definition.base_url if definition else ""
+        self.source_name = definition.source_name if definition else ""
+        self.default_url = definition.default_url if definition else None
+        self.item_limit = definition.item_limit if definition else 20
+        self.spec = definition.spec if definition else None
+        self.backend = definition.backend if definition else None  # overrides settings.parser_backend
+
+    async def _read_body(self, response: httpx.Response, url: str) -> bytes:
+        """Read streamed response body up to the configured size cap
+
+        The whole body is buffered even when the listing needs only its first
+        items: the page hash covers all of it, and extraction runs on complete
+        bytes in the parse executor. Peak memory per fetch is therefore at
+        least the body size, up to `http_max_response_bytes`.
+        """
+        limit = settings.http_max_response_bytes
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > limit:
+                logger.warning(f"Response from {url} exceeds {limit} bytes, truncating")
+                del body[limit:]
+                break
+        return bytes(body)
+
+    async def _get(self, url: str, headers: dict) -> tuple[httpx.Response, bytes]:
+        """GET with per-host rate limiting, Retry-After and jittered backoff"""
+        throttle = host_scheduler.for_url(url)
+        client = http_clients.get_client(url)
+
+        for attempt in range(settings.http_max_retries + 1):
+            last_attempt = attempt == settings.http_max_retries
+            await throttle.acquire()
+
+            try:
+                request = client.build_request("GET", url, headers=headers)
+                response = await client.send(request, stream=True)
+                try:
+                    retry = response.status_code in RETRY_STATUSES and not last_attempt
+                    body = b"" if retry else await self._read_body(response, url)
+                finally:
+                    await response.aclose()
+            except httpx.TransportError as e:
+                # Pauses the host with jittered backoff, next acquire() waits it out
+                throttle.on_throttled()
+                if last_attempt:
+                    raise
+                logger.warning(f"Retrying {url} after error: {e}")
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                throttle.on_success()
+                return response, body
+
+            retry_after = None
+            if response.status_code in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            throttle.on_throttled(retry_after)
+
+            if last_attempt:
+                return response, body
+            logger.warning(f"Got {response.status_code} from {url}, retrying")
+
+        return response, body
+
     async def fetch_page(self, url: str) -> Optional[str]:
         """Fetch page content"""
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(url, headers=self.headers, timeout=30.0)
-                response.raise_for_status()
-                return response.text
+            response, body = await self._get(url, self.headers)
+            response.raise_for_status()
+            return body.decode(response.charset_encoding or 'utf-8', errors='replace')
+        except Exception as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return None
+
+    async def fetch_listing(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> Optional[FetchResult]:
+        """Fetch listing page using ETag/Last-Modified validators and content hash"""
+        headers = dict(self.headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        try:
+            response, body = await self._get(url, headers)
+
+            if response.status_code == 304:
+                logger.info(f"Not modified: {url}")
+                return FetchResult(
+                    content=None,
+                    etag=etag,
+                    last_modified=last_modified,
+                    content_hash=content_hash,
+                    not_modified=True
+                )
+
+            response.raise_for_status()
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
 
-    def parse(self, url: str) -> List[dict]:
-        """Parse news from source - to be implemented by subclasses"""
-        raise NotImplementedError
+        # Servers that ignore validators still let us skip an identical page
+        page_hash = hashlib.sha256(body).hexdigest()
+        if page_hash == content_hash:
+            logger.info(f"Content unchanged: {url}")
+
+        return FetchResult(
+            content=body,
+            encoding=response.charset_encoding,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            content_hash=page_hash,
+            not_modified=page_hash == content_hash
+        )
+
+    async def parse(self, url: str = None) -> List[ParsedItem]:
+        """Parse news from source"""
+        if url is None:
+            url = self.default_url
+
+        logger.info(f"Parsing {url}")
+
+        page = await self.fetch_listing(url)
+        if page is None or not page.content:
+            return []
+
+        return await parse_executor.extract(self, page.content, url, page.encoding)
+
+    def get_source_name(self, url: str) -> str:
+        """Source name stored with news items parsed from the URL"""
+        if self.definition:
+            for pattern, template in self.definition.source_names:
+                match = pattern.search(url)
+                if match:
+                    return template.format(*(group.strip('/').title() for group in match.groups()))
+        return self.source_name
+
+    def extract(self, content: bytes, url: str, encoding: Optional[str] = None) -> List[ParsedItem]:
+        """Extract news items from listing page bytes using the parser spec"""
+        if self.spec is None:
+            raise NotImplementedError
+
+        backend = get_backend(self.backend or settings.parser_backend)
+        source_name = self.get_source_name(url)
+        news_items = []
+
+        for fields in backend.extract(content, self.spec, self.item_limit, encoding):
+            try:
+                news_item = self._build_item(fields, source_name)
+                if news_item:
+                    news_items.append(news_item)
+            except Exception as e:
+                logger.error(f"Failed to parse article: {e}")
+                continue
+
+        logger.info(f"Parsed {len(news_items)} news items from {source_name}")
+        return news_items
+
+    def _build_item(self, fields: dict, source_name: str) -> Optional[ParsedItem]:
+        """Build news item from raw extracted fields"""
+        title = clean_text(fields['title'])
+        link = fields['link']
+        if not title or not link:
+            return None
+
+        # Use current time if the page has no parseable date
+        published_at = datetime.utcnow()
+        if fields['date']:
+            published_at = parse_date(fields['date']) or published_at
+
+        url = urljoin(self.base_url, link)
+        return ParsedItem(
+            title=title,
+            url=url,
+            url_hash=url_hash(url),
+            source=source_name,
+            published_at=published_at,
+            summary=clean_text(fields['summary']) or title,
+            raw_text=None  # Will be filled if we fetch full article
+        )
 
 
 # Factory function to get parser by source type
 def get_parser(source_type: str) -> Optional[NewsParser]:
-    """Get parser instance by source type"""
-    source_type_lower = source_type.lower()
-
-    # Check if it's an RBC source (rbc, rbc_politics, rbc_economics, etc.)
-    if source_type_lower == 'rbc' or source_type_lower.startswith('rbc_'):
-        from app.news_parser.rbc_parser import RBCParser
-        return RBCParser()
-
-    # Check if it's a Habr source
-    if source_type_lower == 'habr' or source_type_lower.startswith('habr_'):
-        from app.news_parser.habr_parser import HabrParser
-        return HabrParser()
-
-    # Add other parsers here in the future
-    parsers = {
-        # 'vc': VCParser,
-        # 'tproger': TprogerParser,
-    }
-
-    parser_class = parsers.get(source_type_lower)
-    if parser_class:
-        return parser_class()
-
-    logger.error(f"Unknown source type: {source_type}")
-    return None
+    """Get cached parser instance by source type"""
+    parser = parser_registry.get_parser(source_type)
+    if parser is None:
+        logger.error(f"Unknown source type: {source_type}")
+    return parser
@@ -0,0 +1,90 @@
+"""Incremental extraction of listing containers from HTML bytes"""
+from typing import Iterator, List, Optional, Sequence
+
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ContainerMatcher:
+    """Match listing container elements by tag and CSS class"""
+
+    def __init__(self, tag: str, css_class: Optional[str] = None):
+        self.tag = tag
+        self.css_class = css_class
+
+    def matches(self, element) -> bool:
+        if element.tag != self.tag:
+            return False
+        if self.css_class is None:
+            return True
+        return self.css_class in (element.get('class') or '').split()
+
+
+def _release(element):
+    """Free a processed container and everything parsed before it"""
+    element.clear(keep_tail=True)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _feed(parser, content: bytes) -> Iterator[None]:
+    """Feed content to the pull parser chunk by chunk, pausing after each one"""
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset:offset + CHUNK_SIZE])
+        yield
+    try:
+        parser.close()
+    except etree.LxmlError:
+        # Empty or badly broken document, keep whatever was parsed
+        pass
+    yield
+
+
+def iter_listing_elements(
+    content: bytes,
+    matchers: Sequence[ContainerMatcher],
+    limit: int,
+    encoding: Optional[str] = None
+) -> Iterator:
+    """Yield listing containers while feeding the page to lxml chunk by chunk
+
+    `matchers` are tried in order of preference: elements of the first one
+    are yielded as soon as they are closed and parsing stops once `limit`
+    of them are found. Later matchers are fallbacks used only when the
+    first one finds nothing. Yielded elements are cleared once the caller
+    asks for the next one, so they must be processed right away. This
+    bounds the parsed tree, `content` itself is already fully in memory.
+    """
+    parser = etree.HTMLPullParser(
+        events=('end',),
+        tag={matcher.tag for matcher in matchers},
+        encoding=encoding or 'utf-8'
+    )
+    primary, fallbacks = matchers[0], matchers[1:]
+    fallback_found: List[list] = [[] for _ in fallbacks]
+    found = 0
+
+    for _ in _feed(parser, content):
+        for _, element in parser.read_events():
+            if primary.matches(element):
+                yield element
+                found += 1
+                _release(element)
+                if found >= limit:
+                    return
+                continue
+
+            for matcher, buffered in zip(fallbacks, fallback_found):
+                if matcher.matches(element):
+                    if len(buffered) < limit:
+                        buffered.append(element)
+                    break
+
+    if found == 0:
+        for buffered in fallback_found:
+            if buffered:
+                yield from buffered
+                return
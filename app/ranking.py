@@ -0,0 +1,120 @@
+"""Relevance ranking of news waiting for generation"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+
+from app.config import settings
+from app.config_cache import config_cache
+from app.models import NewsItem, Post
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RankedNews:
+    """News item with its score and score components"""
+    news_item: NewsItem
+    score: float
+    recency: float
+    keyword_matches: int
+    coverage: int
+    source_weight: float
+    matched_keywords: List[str]
+
+
+class RankingEngine:
+    """Scores pending news so generation goes to the most valuable items first
+
+    score = source_weight * (
+        RANKING_RECENCY_WEIGHT * 0.5 ** (age_hours / RANKING_HALF_LIFE_HOURS)
+        + RANKING_KEYWORD_WEIGHT * log(1 + matched keywords)
+        + RANKING_COVERAGE_WEIGHT * log(1 + near-duplicates from other sources)
+    )
+
+    Features are collected per item, scoring runs over the whole batch at once.
+    """
+
+    def source_weight(self, source: str) -> float:
+        """Weight of a news source, `RBC` also applies to `RBC-Politics`"""
+        weights = settings.ranking_source_weights
+        if source in weights:
+            return weights[source]
+        return weights.get(source.split('-', 1)[0], 1.0)
+
+    def score(
+        self,
+        age_hours: np.ndarray,
+        keyword_matches: np.ndarray,
+        coverage: np.ndarray,
+        source_weights: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Score a batch of candidates, returns score and its components"""
+        recency = np.exp2(-np.maximum(age_hours, 0.0) / settings.ranking_half_life_hours)
+        score = source_weights * (
+            settings.ranking_recency_weight * recency
+            + settings.ranking_keyword_weight * np.log1p(keyword_matches)
+            + settings.ranking_coverage_weight * np.log1p(coverage)
+        )
+        return {"score": score, "recency": recency}
+
+    def rank(self, db, limit: int = 5, now: Optional[datetime] = None) -> List[RankedNews]:
+        """Rank original news without posts, best first"""
+        now = now or datetime.utcnow()
+
+        # Only the freshest candidates compete, older ones would score ~0 anyway
+        candidates = db.query(NewsItem).outerjoin(Post).filter(
+            Post.id == None,
+            NewsItem.duplicate_of_id == None,
+            # Items submitted to a generation batch get their posts from it
+            NewsItem.generation_batch_id == None
+        ).order_by(NewsItem.published_at.desc()).limit(settings.ranking_candidate_limit).all()
+
+        if not candidates:
+            return []
+
+        ids = [item.id for item in candidates]
+        coverage_counts = dict(
+            db.query(NewsItem.duplicate_of_id, func.count(NewsItem.id))
+            .filter(NewsItem.duplicate_of_id.in_(ids))
+            .group_by(NewsItem.duplicate_of_id)
+            .all()
+        )
+
+        matcher = config_cache.keyword_matcher()
+        matched_keywords = [
+            matcher.match(f"{item.title} {item.summary or ''}") if matcher else []
+            for item in candidates
+        ]
+
+        age_hours = np.array(
+            [(now - item.published_at.replace(tzinfo=None)).total_seconds() / 3600 for item in candidates],
+            dtype=np.float64
+        )
+        keyword_matches = np.array([len(matched) for matched in matched_keywords], dtype=np.float64)
+        coverage = np.array([coverage_counts.get(news_id, 0) for news_id in ids], dtype=np.float64)
+        source_weights = np.array([self.source_weight(item.source) for item in candidates], dtype=np.float64)
+
+        scores = self.score(age_hours, keyword_matches, coverage, source_weights)
+
+        # Highest score first, fresher item wins a tie
+        order = np.lexsort((age_hours, -scores["score"]))[:limit]
+        return [
+            RankedNews(
+                news_item=candidates[i],
+                score=float(scores["score"][i]),
+                recency=float(scores["recency"][i]),
+                keyword_matches=int(keyword_matches[i]),
+                coverage=int(coverage[i]),
+                source_weight=float(source_weights[i]),
+                matched_keywords=matched_keywords[i]
+            )
+            for i in order
+        ]
+
+
+# Global ranking engine instance
+ranking_engine = RankingEngine()
@@ -0,0 +1,21 @@
+"""Shared Redis connection"""
+from typing import Optional
+
+import redis
+
+from app.config import settings
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get process-wide Redis client"""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout
+        )
+    return _redis
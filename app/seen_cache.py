@@ -0,0 +1,151 @@
+"""Tiered cache of already stored news URLs"""
+import logging
+import math
+from collections import OrderedDict
+from typing import Iterable, List
+
+import redis
+from sqlalchemy import select
+
+from app.config import settings
+from app.models import NewsItem
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+WARM_BATCH_SIZE = 10000
+WARM_LOCK_TTL = 600
+
+
+class SeenUrlCache:
+    """Tells which URL hashes are already stored without asking the database
+
+    The first tier is a bounded LRU of recent hashes in the current
+    process, the second a Bloom filter in a Redis bitmap shared by all
+    workers and warmed from `news_items` once. A miss in both tiers means
+    the URL is new for sure; a Bloom hit is wrong with probability
+    `seen_bloom_error_rate` while the filter holds less than
+    `seen_bloom_capacity` URLs.
+    """
+
+    key_prefix = "aibot:seen"
+
+    def __init__(self):
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._ready = False
+        self.capacity = settings.seen_bloom_capacity
+        # Optimal bit count and number of hash functions for the error rate
+        self.size = math.ceil(-self.capacity * math.log(settings.seen_bloom_error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        # Sizing is part of the key, so changing it starts a fresh filter
+        self.key = f"{self.key_prefix}:bloom:{self.size}:{self.hash_count}"
+        self.stats = {"lru_hits": 0, "bloom_hits": 0, "misses": 0}
+
+    @property
+    def _ready_key(self) -> str:
+        return f"{self.key}:ready"
+
+    @property
+    def _warm_lock_key(self) -> str:
+        return f"{self.key}:warming"
+
+    def _positions(self, value: int) -> List[int]:
+        """Bit offsets for a 64-bit hash, derived by double hashing"""
+        value &= (1 << 64) - 1
+        h1, h2 = value & 0xFFFFFFFF, (value >> 32) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def _remember(self, value: int):
+        self._lru[value] = None
+        self._lru.move_to_end(value)
+        if len(self._lru) > settings.seen_lru_size:
+            self._lru.popitem(last=False)
+
+    def _set_bits(self, r: redis.Redis, hashes: Iterable[int]):
+        pipe = r.pipeline(transaction=False)
+        for value in hashes:
+            for position in self._positions(value):
+                pipe.setbit(self.key, position, 1)
+        pipe.execute()
+
+    def filter_new(self, hashes: List[int]) -> List[bool]:
+        """Flag hashes that may be new, only those need a database check"""
+        result = [True] * len(hashes)
+        pending = []
+        for i, value in enumerate(hashes):
+            if value in self._lru:
+                self._lru.move_to_end(value)
+                result[i] = False
+                self.stats["lru_hits"] += 1
+            else:
+                pending.append(i)
+
+        if pending:
+            try:
+                r = get_redis()
+                if self._ready:
+                    pipe = r.pipeline(transaction=False)
+                    for i in pending:
+                        for position in self._positions(hashes[i]):
+                            pipe.getbit(self.key, position)
+                    bits = pipe.execute()
+
+                    for n, i in enumerate(pending):
+                        if all(bits[n * self.hash_count:(n + 1) * self.hash_count]):
+                            result[i] = False
+                            self._remember(hashes[i])
+                            self.stats["bloom_hits"] += 1
+            except redis.RedisError as e:
+                # Fall back to the database check
+                logger.warning(f"Seen URL filter unavailable: {e}")
+
+        self.stats["misses"] += sum(result)
+        return result
+
+    def add(self, hashes: Iterable[int]):
+        """Mark hashes as stored"""
+        hashes = list(hashes)
+        for value in hashes:
+            self._remember(value)
+
+        try:
+            self._set_bits(get_redis(), hashes)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to update seen URL filter: {e}")
+
+    def warm(self, db):
+        """Load stored URL hashes into the Bloom filter if it isn't built yet"""
+        try:
+            r = get_redis()
+            self._ready = bool(r.exists(self._ready_key))
+            if self._ready:
+                return
+
+            # Only one worker builds the filter, others use the database meanwhile
+            if not r.set(self._warm_lock_key, 1, nx=True, ex=WARM_LOCK_TTL):
+                return
+
+            count = 0
+            rows = db.execute(
+                select(NewsItem.url_hash).execution_options(yield_per=WARM_BATCH_SIZE)
+            ).scalars()
+            for batch in rows.partitions():
+                self._set_bits(r, batch)
+                count += len(batch)
+
+            r.set(self._ready_key, count)
+            r.delete(self._warm_lock_key)
+            self._ready = True
+            logger.info(f"Warmed seen URL filter with {count} URLs")
+
+            if count > self.capacity:
+                logger.warning(
+                    f"Seen URL filter holds {count} URLs, more than its capacity "
+                    f"{self.capacity}; raise SEEN_BLOOM_CAPACITY"
+                )
+        except redis.RedisError as e:
+            logger.warning(f"Failed to warm seen URL filter: {e}")
+
+
+# Global seen URL cache instance
+seen_urls = SeenUrlCache()
@@ -1,41 +1,38 @@
 """Celery tasks for asynchronous processing"""
 import asyncio
 import logging
+import time
 from datetime import datetime
+from urllib.parse import urlsplit
 
 from sqlalchemy import and_
 
+from app.ai.batch import batch_generator
 from app.ai.generator import post_generator
+from app.ai.latency import FETCH_TO_PUBLISH, latency_tracker
+from app.ai.openai_client import openai_client
+from app.ai.prompt_builder import prompt_builder
+from app.ai.rate_limiter import rate_limiter
+from app.ai.router import model_router
 from app.config import settings
-from app.models import Keyword, NewsItem, Post, SessionLocal, Source
+from app.config_cache import config_cache
+from app.ingest import build_rows, dedupe, filter_by_keywords, remember_saved, save_news_items
+from app.models import NewsItem, Post, SessionLocal, Source, SourceFetchState
+from app.near_duplicates import near_duplicates
+from app.news_parser.circuit_breaker import circuit_breaker
+from app.news_parser.executor import parse_executor
+from app.news_parser.http_client import http_clients
+from app.news_parser.politeness import host_scheduler
 from app.news_parser.sites import get_parser
+from app.ranking import ranking_engine
+from app.seen_cache import seen_urls
 from app.telegram.publisher import telegram_publisher
 
 logger = logging.getLogger(__name__)
 
 
-def filter_news_by_keywords(news_item: NewsItem, keywords: list[str]) -> bool:
-    """Filter news by keywords"""
-    if not keywords:
-        return True  # If no keywords, accept all news
-
-    text = f"{news_item.title} {news_item.summary or ''}".lower()
-
-    for keyword in keywords:
-        if keyword.lower() in text:
-            return True
-
-    return False
-
-
-def is_duplicate_news(url: str, db) -> bool:
-    """Check if news already exists in database"""
-    existing = db.query(NewsItem).filter(NewsItem.url == url).first()
-    return existing is not None
-
-
-async def parse_news_from_source(source: Source, db):
-    """Parse news from a single source"""
+async def parse_news_from_source(source: Source, db) -> dict:
+    """Parse news from a single source and return a result summary"""
     try:
         logger.info(f"Parsing news from {source.name}")
 
@@ -43,60 +40,140 @@ async def parse_news_from_source(source: Source, db):
         parser = get_parser(source.name.lower())
         if not parser:
             logger.error(f"No parser found for {source.name}")
-            return
-
-        # Parse news
-        news_items = await parser.parse(source.url)
-
-        # Get keywords for filtering
-        keywords = [kw.word for kw in db.query(Keyword).all()]
-
-        # Process each news item
-        saved_count = 0
-        for item in news_items:
-            # Check for duplicates
-            if is_duplicate_news(item['url'], db):
-                logger.debug(f"Skipping duplicate: {item['url']}")
-                continue
-
-            # Create NewsItem object for filtering
-            news_item = NewsItem(**item)
-
-            # Filter by keywords
-            if not filter_news_by_keywords(news_item, keywords):
-                logger.debug(f"Filtered out by keywords: {item['title'][:50]}...")
-                continue
-
-            # Save to database
-            db.add(news_item)
-            saved_count += 1
+            return {"status": "error", "error": "No parser found"}
+
+        # Fetch listing page with validators saved on the previous run
+        state = db.query(SourceFetchState).filter(
+            SourceFetchState.source_id == source.id
+        ).first()
+        if state is None:
+            state = SourceFetchState(source_id=source.id)
+            db.add(state)
+
+        page = await parser.fetch_listing(
+            source.url,
+            etag=state.etag,
+            last_modified=state.last_modified,
+            content_hash=state.content_hash
+        )
+        if page is None:
+            db.rollback()
+            circuit_breaker.record_failure(source.id)
+            return {"status": "error", "error": "Failed to fetch listing page"}
+        circuit_breaker.record_success(source.id)
+
+        state.etag = page.etag
+        state.last_modified = page.last_modified
+        state.content_hash = page.content_hash
+
+        # Nothing changed since the last run, skip parsing and deduplication
+        if page.not_modified:
+            db.commit()
+            logger.info(f"No changes in {source.name}")
+            return {"status": "not_modified", "parsed": 0, "saved": 0}
+
+        # Parse news in the process pool, other fetches keep running meanwhile
+        news_items = await parse_executor.extract(parser, page.content, source.url, page.encoding)
+
+        # Drop URLs stored on previous runs, only possibly new ones reach the database
+        new_items = list(dedupe(news_items))
+        seen_count = len(news_items) - len(new_items)
+
+        # Only items passing the keyword filter become insert rows
+        rows = list(build_rows(filter_by_keywords(new_items, config_cache.keyword_matcher())))
+
+        # Save all new items at once, duplicates are skipped by the database
+        inserted = save_news_items(rows, db)
+        saved_count = len(inserted)
 
         db.commit()
-        logger.info(f"Saved {saved_count} new items from {source.name}")
+        near_duplicate_count = remember_saved(rows, inserted)
+
+        logger.info(
+            f"Saved {saved_count} new items from {source.name} "
+            f"({near_duplicate_count} near-duplicates), "
+            f"skipped {seen_count} seen and {len(rows) - saved_count} duplicates"
+        )
+        return {
+            "status": "ok",
+            "parsed": len(news_items),
+            "seen": seen_count,
+            "saved": saved_count,
+            "near_duplicates": near_duplicate_count
+        }
 
     except Exception as e:
         logger.error(f"Error parsing news from {source.name}: {e}")
         db.rollback()
+        return {"status": "error", "error": str(e)}
+
+
+async def _parse_source_limited(
+    source: Source,
+    global_limit: asyncio.Semaphore,
+    host_limits: dict[str, asyncio.Semaphore]
+) -> dict:
+    """Parse one source under global and per-host concurrency limits"""
+    host = urlsplit(source.url).netloc.lower()
+    host_limit = host_limits.setdefault(
+        host, asyncio.Semaphore(settings.parse_per_host_concurrency)
+    )
+
+    async with global_limit, host_limit:
+        # Checked right before the fetch, so a half-open probe isn't claimed
+        # while waiting for a slot and can't expire before it runs
+        if not circuit_breaker.allow(source.id):
+            logger.info(f"Skipping {source.name}: circuit breaker is open")
+            return {"status": "skipped", "error": "Circuit breaker is open"}
+
+        # Each source gets its own session so one failure can't roll back others
+        db = SessionLocal()
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                parse_news_from_source(source, db),
+                timeout=settings.parse_source_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out parsing {source.name} after {settings.parse_source_timeout}s")
+            db.rollback()
+            circuit_breaker.record_failure(source.id)
+            result = {"status": "timeout"}
+        finally:
+            db.close()
+
+    result["duration"] = round(time.monotonic() - started, 3)
+    return result
+
+
+async def parse_sources(sources: list[Source]) -> dict[str, dict]:
+    """Parse all sources concurrently in one event loop"""
+    global_limit = asyncio.Semaphore(settings.parse_max_concurrency)
+    host_limits: dict[str, asyncio.Semaphore] = {}
+
+    try:
+        results = await asyncio.gather(*[
+            _parse_source_limited(source, global_limit, host_limits)
+            for source in sources
+        ])
+    finally:
+        await http_clients.aclose()
+
+    return {source.name: result for source, result in zip(sources, results)}
 
 
 async def generate_and_publish_posts(db):
-    """Generate AI posts and publish them"""
+    """Generate AI posts concurrently and publish them as they are ready"""
     try:
-        # Find news items without posts
-        news_without_posts = db.query(NewsItem).outerjoin(Post).filter(
-            Post.id == None
-        ).limit(5).all()  # Process 5 at a time
-
-        for news_item in news_without_posts:
+        # Pick the highest ranked original news items without posts
+        ranked_news = ranking_engine.rank(db, limit=settings.generation_batch_size)
+        news_items = [ranked.news_item for ranked in ranked_news]
+
+        # Generation runs concurrently under the OpenAI rate limiter,
+        # posts are published one at a time in order of completion
+        priorities = {ranked.news_item.id: ranked.score for ranked in ranked_news}
+        async for news_item, generated_text in post_generator.generate_posts(news_items, priorities):
             try:
-                # Generate post
-                logger.info(f"Generating post for news {news_item.id}")
-                generated_text = await post_generator.generate_post(
-                    title=news_item.title,
-                    summary=news_item.summary or news_item.title,
-                    url=news_item.url
-                )
-
                 if not generated_text:
                     logger.warning(f"Failed to generate post for news {news_item.id}")
                     continue
@@ -113,20 +190,51 @@ async def generate_and_publish_posts(db):
 
                 # Publish to Telegram
                 logger.info(f"Publishing post {post.id}")
-                await telegram_publisher.publish_post(post, db)
+                if await telegram_publisher.publish_post(post, db):
+                    latency_tracker.record(
+                        FETCH_TO_PUBLISH,
+                        (post.published_at - news_item.created_at).total_seconds()
+                    )
 
-                # Add delay between posts to avoid rate limits
-                await asyncio.sleep(2)
+                # Add delay between posts to avoid Telegram rate limits
+                await asyncio.sleep(settings.telegram_publish_interval)
 
             except Exception as e:
                 logger.error(f"Error processing news {news_item.id}: {e}")
+                db.rollback()
                 continue
 
+        logger.info(f"OpenAI rate limiter: {rate_limiter.stats()}")
+        logger.info(f"OpenAI calls: {openai_client.stats}")
+        logger.info(f"Generation latency: {latency_tracker.stats()}")
+        logger.info(f"Models: {model_router.stats()}")
+        logger.info(f"Prompts: {prompt_builder.stats}")
+
     except Exception as e:
         logger.error(f"Error in generate_and_publish_posts: {e}")
         db.rollback()
 
 
+async def publish_batch_posts(db) -> int:
+    """Publish pending posts produced by generation batches"""
+    posts = db.query(Post).join(NewsItem).filter(
+        Post.status == "pending",
+        NewsItem.generation_batch_id != None
+    ).order_by(Post.created_at).limit(settings.batch_publish_per_run).all()
+
+    published = 0
+    for post in posts:
+        try:
+            logger.info(f"Publishing batch post {post.id}")
+            if await telegram_publisher.publish_post(post, db):
+                published += 1
+            await asyncio.sleep(settings.telegram_publish_interval)
+        except Exception as e:
+            logger.error(f"Error publishing post {post.id}: {e}")
+            db.rollback()
+    return published
+
+
 # Main parsing task
 def parse_all_sources_task():
     """Main task to parse all enabled sources"""
@@ -135,17 +243,29 @@ def parse_all_sources_task():
         logger.info("Starting news parsing task")
 
         # Get all enabled sources
-        sources = db.query(Source).filter(Source.enabled == True).all()
+        sources = config_cache.enabled_sources()
 
         if not sources:
             logger.warning("No enabled sources found")
             return
 
-        # Parse each source
-        for source in sources:
-            asyncio.run(parse_news_from_source(source, db))
+        # Build the shared seen URL filter on first run
+        seen_urls.warm(db)
+        near_duplicates.load(db)
+
+        # Parse all sources
+        summary = asyncio.run(parse_sources(sources))
 
+        for name, result in summary.items():
+            logger.info(f"Source {name}: {result}")
+
+        host_stats = host_scheduler.stats()
+        for host, stats in host_stats.items():
+            logger.info(f"Host {host}: {stats}")
+
+        logger.info(f"Seen URL cache: {seen_urls.stats}")
         logger.info("News parsing completed")
+        return {"sources": summary, "hosts": host_stats, "seen_urls": dict(seen_urls.stats)}
 
     except Exception as e:
         logger.error(f"Error in parse_all_sources_task: {e}")
@@ -164,3 +284,38 @@ def generate_and_publish_task():
         logger.error(f"Error in generate_and_publish_task: {e}")
     finally:
         db.close()
+
+
+def submit_generation_batch_task():
+    """Task to submit older pending news to the Batch API"""
+    if not settings.batch_enabled:
+        return
+    db = SessionLocal()
+    try:
+        batch = asyncio.run(batch_generator.submit(db))
+        if batch:
+            return {"batch": batch.provider_batch_id, "requests": batch.request_count}
+    except Exception as e:
+        logger.error(f"Error in submit_generation_batch_task: {e}")
+    finally:
+        db.close()
+
+
+def poll_generation_batches_task():
+    """Task to collect finished batches and publish their posts"""
+    if not settings.batch_enabled:
+        return
+    db = SessionLocal()
+    try:
+        async def poll_and_publish():
+            summary = await batch_generator.poll(db)
+            summary["published"] = await publish_batch_posts(db)
+            return summary
+
+        summary = asyncio.run(poll_and_publish())
+        logger.info(f"Generation batches: {summary}")
+        return summary
+    except Exception as e:
+        logger.error(f"Error in poll_generation_batches_task: {e}")
+    finally:
+        db.close()
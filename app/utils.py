@@ -3,15 +3,67 @@ import hashlib
 import logging
 from datetime import datetime
 from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
+# Query parameters that only track where the click came from
+TRACKING_PARAMS = {
+    'from', 'ref', 'referrer', 'source', 'rss', 'fbclid', 'gclid', 'yclid',
+    'ysclid', 'mc_cid', 'mc_eid', '_openstat',
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
 
 def generate_hash(text: str) -> str:
     """Generate SHA256 hash from text"""
     return hashlib.sha256(text.encode()).hexdigest()
 
 
+def canonicalize_url(url: str) -> str:
+    """Normalize URL for deduplication
+
+    http/https variants, `www.` prefix, default ports, fragments, trailing
+    slashes, parameter order and tracking parameters (utm_*, from, ...)
+    don't change the canonical form.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or '/'
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def to_int64(value: int) -> int:
+    """Reinterpret unsigned 64-bit value as signed, to fit PostgreSQL BIGINT"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def hash64(text: str) -> int:
+    """Signed 64-bit SHA256 prefix"""
+    return to_int64(int(generate_hash(text)[:16], 16))
+
+
+def url_hash(url: str) -> int:
+    """Dedupe key of a news URL"""
+    return hash64(canonicalize_url(url))
+
+
 def is_duplicate(url: str, existing_urls: list[str]) -> bool:
     """Check if URL is duplicate"""
     return url in existing_urls
@@ -3,7 +3,12 @@ from celery import Celery
 from celery.schedules import crontab
 
 from app.config import settings
-from app.tasks import generate_and_publish_task, parse_all_sources_task
+from app.tasks import (
+    generate_and_publish_task,
+    parse_all_sources_task,
+    poll_generation_batches_task,
+    submit_generation_batch_task,
+)
 
 # Create Celery app
 celery_app = Celery(
@@ -38,6 +43,18 @@ def generate_and_publish():
     return generate_and_publish_task()
 
 
+@celery_app.task(name='submit_generation_batch')
+def submit_generation_batch():
+    """Submit older news to the Batch API"""
+    return submit_generation_batch_task()
+
+
+@celery_app.task(name='poll_generation_batches')
+def poll_generation_batches():
+    """Collect finished generation batches"""
+    return poll_generation_batches_task()
+
+
 # Celery Beat schedule
 celery_app.conf.beat_schedule = {
     'parse-news-task': {
@@ -48,4 +65,12 @@ celery_app.conf.beat_schedule = {
         'task': 'generate_and_publish',
         'schedule': crontab(minute=f'*/{settings.parse_interval_minutes}'),
     },
+    'submit-generation-batch': {
+        'task': 'submit_generation_batch',
+        'schedule': crontab(minute=0, hour='*/6'),
+    },
+    'poll-generation-batches': {
+        'task': 'poll_generation_batches',
+        'schedule': crontab(minute='*/10'),
+    },
 }
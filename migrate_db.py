@@ -0,0 +1,134 @@
+"""Database migration script for existing installations
+
+Every step is idempotent, so the script can be re-run safely after
+each update. Fresh databases get the current schema from init_db.py.
+"""
+import sys
+
+from sqlalchemy import text
+
+from app.models import engine, init_db
+from app.near_duplicates import news_fingerprint
+from app.utils import hash64, url_hash
+
+BATCH_SIZE = 1000
+
+
+def add_url_hash(conn):
+    """Replace unique index on news_items.url with one on url_hash"""
+    conn.execute(text("ALTER TABLE news_items ADD COLUMN IF NOT EXISTS url_hash BIGINT"))
+
+    seen = set(conn.execute(
+        text("SELECT url_hash FROM news_items WHERE url_hash IS NOT NULL")
+    ).scalars())
+    last_id = 0
+    updated = collisions = 0
+
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, url FROM news_items "
+                "WHERE url_hash IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            value = url_hash(row.url)
+            if value in seen:
+                # Another variant of an already stored URL, keep the row under a unique key
+                value = hash64(f"{row.id}:{row.url}")
+                collisions += 1
+            seen.add(value)
+            params.append({"id": row.id, "url_hash": value})
+
+        conn.execute(text("UPDATE news_items SET url_hash = :url_hash WHERE id = :id"), params)
+        updated += len(params)
+        last_id = rows[-1].id
+
+    print(f"  backfilled {updated} rows ({collisions} URL variants of existing news)")
+
+    conn.execute(text("ALTER TABLE news_items ALTER COLUMN url_hash SET NOT NULL"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_news_items_url_hash ON news_items (url_hash)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_news_items_url"))
+
+
+def add_simhash(conn):
+    """Add near-duplicate columns and fingerprint existing news"""
+    conn.execute(text("ALTER TABLE news_items ADD COLUMN IF NOT EXISTS simhash BIGINT"))
+    conn.execute(text(
+        "ALTER TABLE news_items ADD COLUMN IF NOT EXISTS duplicate_of_id INTEGER "
+        "REFERENCES news_items (id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_news_items_duplicate_of_id ON news_items (duplicate_of_id)"
+    ))
+
+    last_id = 0
+    updated = 0
+
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, title, summary FROM news_items "
+                "WHERE simhash IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+
+        params = [
+            {"id": row.id, "simhash": news_fingerprint(row.title, row.summary)}
+            for row in rows
+        ]
+        conn.execute(text("UPDATE news_items SET simhash = :simhash WHERE id = :id"), params)
+        updated += len(params)
+        last_id = rows[-1].id
+
+    print(f"  fingerprinted {updated} rows")
+
+
+def add_generation_batch_id(conn):
+    """Link news to Batch API jobs, generation_batches is created by init_db"""
+    conn.execute(text(
+        "ALTER TABLE news_items ADD COLUMN IF NOT EXISTS generation_batch_id INTEGER "
+        "REFERENCES generation_batches (id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_news_items_generation_batch_id "
+        "ON news_items (generation_batch_id)"
+    ))
+
+
+MIGRATIONS = [
+    ("news_items.url_hash", add_url_hash),
+    ("news_items.simhash", add_simhash),
+    ("news_items.generation_batch_id", add_generation_batch_id),
+]
+
+
+def migrate():
+    """Create missing tables and apply schema changes"""
+    print("Creating missing tables...")
+    init_db()
+
+    try:
+        for name, step in MIGRATIONS:
+            print(f"Applying {name}...")
+            # One transaction per step
+            with engine.begin() as conn:
+                step(conn)
+        print("\nDatabase migration completed successfully!")
+    except Exception as e:
+        print(f"Error during migration: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -22,12 +22,12 @@ async def test_habr_parser():
         print("First 5 news items:")
         print("-" * 80)
         for i, item in enumerate(news[:5], 1):
-            print(f"\n{i}. {item['title'][:70]}...")
-            print(f"   URL: {item['url']}")
-            print(f"   Source: {item['source']}")
-            if item['summary'] and item['summary'] != item['title']:
-                print(f"   Summary: {item['summary'][:100]}...")
-            print(f"   Published: {item['published_at']}")
+            print(f"\n{i}. {item.title[:70]}...")
+            print(f"   URL: {item.url}")
+            print(f"   Source: {item.source}")
+            if item.summary and item.summary != item.title:
+                print(f"   Summary: {item.summary[:100]}...")
+            print(f"   Published: {item.published_at}")
 
     print("\n" + "=" * 80)
     print("✅ Habr parser works correctly!")
@@ -12,9 +12,9 @@ async def test_parser():
 
     print(f"\nFound {len(news)} news items:")
     for i, item in enumerate(news[:5], 1):
-        print(f"\n{i}. {item['title'][:100]}")
-        print(f"   URL: {item['url']}")
-        print(f"   Summary: {item['summary'][:100] if item['summary'] else 'N/A'}")
+        print(f"\n{i}. {item.title[:100]}")
+        print(f"   URL: {item.url}")
+        print(f"   Summary: {item.summary[:100] if item.summary else 'N/A'}")
 
 
 if __name__ == "__main__":
@@ -24,8 +24,8 @@ async def test_parser():
         print(f"  ✓ Parsed {len(news)} items")
 
         if news:
-            print(f"  First item: {news[0]['title'][:60]}...")
-            print(f"  Source: {news[0]['source']}")
+            print(f"  First item: {news[0].title[:60]}...")
+            print(f"  Source: {news[0].source}")
 
     print("\n" + "=" * 80)
     print("✅ Parser works correctly!")
@@ -0,0 +1,6 @@
+"""Settings required to import the app in offline tests"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "1:test")
+os.environ.setdefault("TELEGRAM_CHANNEL_ID", "@test")
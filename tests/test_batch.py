@@ -0,0 +1,90 @@
+"""Batch generation with the local backend"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai.batch import CUSTOM_ID_PREFIX, BatchGenerator, LocalBatchBackend
+from app.config import settings
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+
+def write_requests(path, news_ids):
+    with open(path, "w", encoding="utf-8") as f:
+        for news_id in news_ids:
+            request = {
+                "custom_id": f"{CUSTOM_ID_PREFIX}{news_id}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": settings.openai_model,
+                    "messages": [{"role": "user", "content": f"Новость {news_id}"}],
+                },
+            }
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+
+@pytest.fixture
+def batch_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "batch_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "batch_local_delay", 0)
+    return tmp_path
+
+
+def run_local_batch(path):
+    backend = LocalBatchBackend()
+
+    async def run():
+        batch_id, _ = await backend.submit(str(path))
+        state = await backend.retrieve(batch_id)
+        assert state.status == "completed"
+        return await backend.download(state.output_file_id)
+
+    return asyncio.run(run())
+
+
+def test_local_backend_answers_every_request(batch_dir):
+    path = batch_dir / "requests.jsonl"
+    write_requests(path, [1, 2, 3])
+
+    results = [json.loads(line) for line in run_local_batch(path).splitlines()]
+
+    assert [result["custom_id"] for result in results] == ["news-1", "news-2", "news-3"]
+    assert all(result["response"]["status_code"] == 200 for result in results)
+
+
+def test_local_batch_posts_are_drafts(batch_dir):
+    path = batch_dir / "requests.jsonl"
+    write_requests(path, [1, 2])
+    news_items = [SimpleNamespace(id=news_id, generation_batch_id=7) for news_id in (1, 2, 3)]
+    batch = SimpleNamespace(backend=LocalBatchBackend.name, news_items=news_items)
+    db = FakeSession()
+
+    created = BatchGenerator()._apply_results(db, batch, run_local_batch(path))
+
+    assert created == 2
+    assert sorted(post.news_id for post in db.added) == [1, 2]
+    assert all(post.status == "draft" for post in db.added)
+    # News without a result go back to the queue
+    assert [item.generation_batch_id for item in news_items] == [7, 7, None]
+
+
+def test_openai_batch_posts_are_pending():
+    output = json.dumps({
+        "custom_id": "news-5",
+        "response": {"status_code": 200, "body": {"choices": [{"message": {"content": " Пост "}}]}},
+    })
+    batch = SimpleNamespace(backend="openai", news_items=[SimpleNamespace(id=5, generation_batch_id=1)])
+    db = FakeSession()
+
+    assert BatchGenerator()._apply_results(db, batch, output) == 1
+    assert db.added[0].status == "pending"
+    assert db.added[0].generated_text == "Пост"
@@ -0,0 +1,49 @@
+"""Stemmed Aho-Corasick keyword matching"""
+from app.keyword_matcher import KeywordMatcher, get_matcher, stem_words
+
+
+def test_russian_inflections():
+    matcher = KeywordMatcher(["технология", "искусственный интеллект"])
+    assert matcher.match("Новые технологии искусственного интеллекта") == [
+        "технология", "искусственный интеллект"
+    ]
+    assert matcher.match("Об искусственном интеллекте и технологиях") == [
+        "технология", "искусственный интеллект"
+    ]
+
+
+def test_yo_is_e():
+    assert stem_words("ещё") == stem_words("еще")
+
+
+def test_multi_word_keyword_needs_words_in_a_row():
+    matcher = KeywordMatcher(["машинное обучение"])
+    assert matcher.match("Методы машинного обучения") == ["машинное обучение"]
+    assert matcher.match("Обучение на машинном уровне") == []
+    assert matcher.match("Машинное зрение и обучение") == []
+
+
+def test_overlapping_keywords():
+    matcher = KeywordMatcher(["нейронная сеть", "сеть", "глубокая нейронная сеть", "нейронный"])
+    assert matcher.match("Глубокие нейронные сети") == [
+        "нейронная сеть", "сеть", "глубокая нейронная сеть", "нейронный"
+    ]
+    assert matcher.match("Социальные сети") == ["сеть"]
+
+
+def test_failure_link_after_partial_match():
+    matcher = KeywordMatcher(["открытый исходный код", "исходный код"])
+    assert matcher.match("Открытый и исходный код") == ["исходный код"]
+
+
+def test_english_and_case():
+    matcher = KeywordMatcher(["Machine Learning", "Language Model"])
+    assert matcher.match("LANGUAGE MODELS and machine learning") == ["Machine Learning", "Language Model"]
+
+
+def test_no_partial_words():
+    assert KeywordMatcher(["сеть"]).match("Сетевой протокол") == []
+
+
+def test_get_matcher_reuses_compiled_matcher():
+    assert get_matcher(["б", "а", "а"]) is get_matcher(["а", "б"])
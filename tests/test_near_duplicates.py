@@ -0,0 +1,72 @@
+"""SimHash fingerprints and their band index"""
+import pytest
+
+from app.config import settings
+from app.near_duplicates import (
+    FINGERPRINT_BITS,
+    NearDuplicateIndex,
+    hamming_distance,
+    news_fingerprint,
+    normalize_tokens,
+    simhash,
+)
+
+TITLE = "Центробанк сохранил ключевую ставку на уровне 16 процентов"
+SUMMARY = "Совет директоров Банка России принял решение сохранить ключевую ставку на уровне 16% годовых"
+
+
+@pytest.mark.parametrize("max_distance", [0, 3, 5, 7, 63, 100])
+def test_bands_cover_fingerprint(monkeypatch, max_distance):
+    monkeypatch.setattr(settings, "near_duplicate_max_distance", max_distance)
+    bands = NearDuplicateIndex()._layout()
+
+    assert len(bands) == min(max_distance + 1, FINGERPRINT_BITS)
+    covered = 0
+    for shift, mask in bands:
+        band_bits = mask << shift
+        assert covered & band_bits == 0
+        covered |= band_bits
+    assert covered == (1 << FINGERPRINT_BITS) - 1
+
+    widths = [mask.bit_length() for _, mask in bands]
+    assert max(widths) - min(widths) <= 1
+
+
+def test_close_fingerprints_share_a_band(monkeypatch):
+    monkeypatch.setattr(settings, "near_duplicate_max_distance", 3)
+    index = NearDuplicateIndex()
+    original = simhash(f"{TITLE} {SUMMARY}")
+    index.add(1, original)
+
+    # Flip max_distance bits spread over the fingerprint, including the sign bit
+    near = original ^ (1 << 0) ^ (1 << 31) ^ (1 << 63)
+    assert hamming_distance(original, near) == 3
+    assert index.find(near) == 1
+
+    far = original ^ sum(1 << bit for bit in range(0, 64, 13))
+    assert index.find(far) is None
+
+
+def test_fingerprint_is_signed_bigint():
+    fingerprints = [simhash(f"новость номер {i} {TITLE}") for i in range(200)]
+    assert all(-(1 << 63) <= value < (1 << 63) for value in fingerprints)
+
+
+def test_similar_news_are_close():
+    other = news_fingerprint(
+        "ЦБ сохранил ключевую ставку на уровне 16 процентов",
+        "Совет директоров Банка России принял решение сохранить ключевую ставку на уровне 16% годовых"
+    )
+    unrelated = news_fingerprint("Вышла новая версия Python", "Релиз включает JIT-компилятор")
+    original = news_fingerprint(TITLE, SUMMARY)
+
+    assert hamming_distance(original, other) <= settings.near_duplicate_max_distance
+    assert hamming_distance(original, unrelated) > settings.near_duplicate_max_distance
+
+
+def test_title_repeated_in_summary_counts_once():
+    assert news_fingerprint(TITLE, f"{TITLE}. {SUMMARY}") == news_fingerprint(TITLE, SUMMARY)
+
+
+def test_normalize_tokens():
+    assert normalize_tokens("Ёлка, 5 и 2024 «Новости»!") == ["елка", "5", "2024", "новости"]
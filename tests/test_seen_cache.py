@@ -0,0 +1,95 @@
+"""Bloom filter of stored URL hashes"""
+import math
+
+import pytest
+import redis
+
+import app.seen_cache
+from app.config import settings
+from app.seen_cache import SeenUrlCache
+from app.utils import url_hash
+
+
+class FakeBitmap:
+    """Redis bitmap commands through a pipeline"""
+
+    def __init__(self):
+        self.bits = {}
+        self._queued = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def setbit(self, key, offset, value):
+        assert 0 <= offset
+        self._queued.append(self.bits.get((key, offset), 0))
+        self.bits[(key, offset)] = value
+
+    def getbit(self, key, offset):
+        self._queued.append(self.bits.get((key, offset), 0))
+
+    def execute(self):
+        result, self._queued = self._queued, []
+        return result
+
+
+@pytest.fixture
+def bitmap(monkeypatch):
+    fake = FakeBitmap()
+    monkeypatch.setattr(app.seen_cache, "get_redis", lambda: fake)
+    return fake
+
+
+def test_sizing_matches_error_rate():
+    cache = SeenUrlCache()
+    expected = -settings.seen_bloom_capacity * math.log(settings.seen_bloom_error_rate) / math.log(2) ** 2
+    assert cache.size == math.ceil(expected)
+    assert cache.hash_count == max(1, round(cache.size / cache.capacity * math.log(2)))
+    assert cache.key == f"aibot:seen:bloom:{cache.size}:{cache.hash_count}"
+
+
+def test_positions_are_in_range_and_deterministic():
+    cache = SeenUrlCache()
+    for i in range(1000):
+        value = url_hash(f"https://example.com/news/{i}")
+        positions = cache._positions(value)
+        assert len(positions) == cache.hash_count
+        assert all(0 <= position < cache.size for position in positions)
+        assert positions == cache._positions(value)
+
+
+@pytest.mark.parametrize("signed, unsigned", [(-1, (1 << 64) - 1), (-(1 << 63), 1 << 63)])
+def test_signed_bigint_hash_uses_its_unsigned_bits(signed, unsigned):
+    cache = SeenUrlCache()
+    assert cache._positions(signed) == cache._positions(unsigned)
+
+
+def test_negative_hash_positions_differ_per_function():
+    cache = SeenUrlCache()
+    assert len(set(cache._positions(-123456789012345))) == cache.hash_count
+
+
+def test_added_hashes_are_seen(bitmap):
+    cache = SeenUrlCache()
+    cache._ready = True
+    stored = [url_hash(f"https://example.com/a/{i}") for i in range(50)]
+    cache.add(stored)
+    # Only the Bloom tier can answer
+    cache._lru.clear()
+
+    new = [url_hash(f"https://example.com/b/{i}") for i in range(50)]
+    assert cache.filter_new(stored) == [False] * len(stored)
+    assert cache.filter_new(new) == [True] * len(new)
+    assert cache.stats["bloom_hits"] == len(stored)
+
+
+def test_lru_answers_without_redis(monkeypatch):
+    cache = SeenUrlCache()
+
+    def unavailable():
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(app.seen_cache, "get_redis", unavailable)
+    cache.add([1, 2])
+    assert cache.filter_new([1, 2, 3]) == [False, False, True]
+    assert cache.stats["lru_hits"] == 2
@@ -0,0 +1,44 @@
+"""Canonical URLs and their dedupe hashes"""
+import pytest
+
+from app.utils import canonicalize_url, to_int64, url_hash
+
+VARIANTS = [
+    "https://habr.com/ru/news/1234/",
+    "http://habr.com/ru/news/1234",
+    "https://www.habr.com/ru/news/1234/",
+    "HTTPS://Habr.com:443/ru/news/1234#comments",
+    "https://habr.com/ru/news/1234/?utm_source=rss&utm_medium=feed",
+    "http://www.habr.com/ru/news/1234?from=rss&UTM_campaign=x",
+]
+
+
+@pytest.mark.parametrize("url", VARIANTS)
+def test_variants_share_canonical_form(url):
+    assert canonicalize_url(url) == "https://habr.com/ru/news/1234"
+
+
+def test_variants_share_hash():
+    assert len({url_hash(url) for url in VARIANTS}) == 1
+
+
+def test_meaningful_query_is_kept_and_sorted():
+    assert canonicalize_url("https://rbc.ru/news?utm_source=x&b=2&a=1") == "https://rbc.ru/news?a=1&b=2"
+    assert url_hash("https://rbc.ru/news?id=1") != url_hash("https://rbc.ru/news?id=2")
+
+
+def test_non_default_port_is_kept():
+    assert canonicalize_url("http://example.com:8080/a/") == "https://example.com:8080/a"
+
+
+def test_hash_fits_bigint():
+    hashes = [url_hash(f"https://example.com/news/{i}") for i in range(1000)]
+    assert all(-(1 << 63) <= value < (1 << 63) for value in hashes)
+    assert any(value < 0 for value in hashes)
+
+
+def test_to_int64():
+    assert to_int64(0) == 0
+    assert to_int64((1 << 63) - 1) == (1 << 63) - 1
+    assert to_int64(1 << 63) == -(1 << 63)
+    assert to_int64((1 << 64) - 1) == -1